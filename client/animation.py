@@ -0,0 +1,94 @@
+import time
+
+
+class ZombieAnimation:
+    __slots__ = ('walk_frame', 'walk_timer', 'attack_frame', 'attack_timer')
+
+    def __init__(self, now):
+        self.walk_frame = 0
+        self.walk_timer = now
+        self.attack_frame = 0
+        self.attack_timer = now
+
+
+class PeashooterAnimation:
+    __slots__ = ('shooting', 'frame', 'last_update')
+
+    def __init__(self, now):
+        self.shooting = False
+        self.frame = 0
+        self.last_update = now
+
+
+class IcewallAnimation:
+    __slots__ = ('hit_time', 'last_hit')
+
+    def __init__(self, now):
+        self.hit_time = 0
+        self.last_hit = 0
+
+
+class AnimationStore:
+    """États d'animation des entités vivantes, indexés par identifiant d'entité.
+
+    `sync` compare les entités de l'état courant à celles déjà connues : une entité
+    apparue reçoit un état neuf, une entité disparue (zombie mort, plante détruite ou
+    retirée) est oubliée. `clear` vide tout entre deux parties."""
+
+    def __init__(self):
+        self.zombies = {}
+        self.peashooters = {}
+        self.icewalls = {}
+        self.synced_state = None
+
+    def clear(self):
+        self.zombies.clear()
+        self.peashooters.clear()
+        self.icewalls.clear()
+        self.synced_state = None
+
+    def sync(self, game_state):
+        if game_state is self.synced_state:
+            return
+        self.synced_state = game_state
+        now = time.time()
+
+        zombie_ids = {zombie['id'] for zombie in game_state.get('zombies', [])}
+        self._sync(self.zombies, zombie_ids, ZombieAnimation, now)
+
+        peashooters, icewalls = set(), set()
+        for plant in game_state.get('plants', []):
+            if plant['type'] == 'peashooter':
+                peashooters.add(plant['id'])
+            elif plant['type'] == 'icewall':
+                icewalls.add(plant['id'])
+        self._sync(self.peashooters, peashooters, PeashooterAnimation, now)
+        self._sync(self.icewalls, icewalls, IcewallAnimation, now)
+
+    def _sync(self, states, live_keys, factory, now):
+        if len(states) != len(live_keys) or states.keys() != live_keys:
+            for key in states.keys() - live_keys:
+                del states[key]
+            for key in live_keys - states.keys():
+                states[key] = factory(now)
+
+    def zombie(self, zombie_id):
+        state = self.zombies.get(zombie_id)
+        if state is None:
+            state = self.zombies[zombie_id] = ZombieAnimation(time.time())
+        return state
+
+    def peashooter(self, plant_id):
+        state = self.peashooters.get(plant_id)
+        if state is None:
+            state = self.peashooters[plant_id] = PeashooterAnimation(time.time())
+        return state
+
+    def icewall(self, plant_id):
+        state = self.icewalls.get(plant_id)
+        if state is None:
+            state = self.icewalls[plant_id] = IcewallAnimation(time.time())
+        return state
+
+    def __len__(self):
+        return len(self.zombies) + len(self.peashooters) + len(self.icewalls)
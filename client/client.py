@@ -9,8 +9,13 @@ import socket
 import signal
 import time
 from shared.protocol import TCPConnection, UDPConnection
-from shared.constants import GRID_WIDTH, GRID_HEIGHT, PLANT_TYPES, ZOMBIE_TYPES
+from shared.constants import GRID_WIDTH, GRID_HEIGHT, PLANT_TYPES, ZOMBIE_TYPES, POSITION_SCALE
+from animation import AnimationStore
+from interpolation import SnapshotBuffer
+from profiler import FrameProfiler
+from sprites import read_sprites, convert_sprites, zombie_sprite_name, card_sprite_name, ZOMBIE_SHEETS, ZOMBIE_WALK_FRAMES, PEASHOOTER_FRAMES
 import random
+from collections import OrderedDict, deque
 
 def resource_path(relative_path):
     """Obtenir le chemin absolu pour accéder aux ressources."""
@@ -20,32 +25,78 @@ def resource_path(relative_path):
         base_path = os.path.abspath(".")
     return os.path.join(base_path, relative_path)
 
-
-class Button:
-    def __init__(self, x, y, width, height, text, color=(100, 100, 100)):
-        self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
-        self.color = color
-        self.font = pygame.font.Font(None, 36)
-        self.candy_cane_offset = 0
-        self.segment_length = 10
-        self.buttonClick = pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'buttonclick.ogg')))
-        self.buttonClick.set_volume(0.35)
-
-    def draw(self, screen):
-        pygame.draw.rect(screen, self.color, self.rect)
+FULL_FRAME_RATE = 60
+MENU_FRAME_RATE = 30
+IDLE_FRAME_RATE = 10
+# Après une entrée du joueur, l'affichage reste fluide quelques instants (survol, clics)
+INPUT_GRACE = 1.0
+INPUT_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                pygame.MOUSEMOTION, pygame.MOUSEWHEEL, pygame.TEXTINPUT)
+# Au-delà, restaurer les rectangles sales un par un coûte plus cher que tout redessiner
+MAX_DIRTY_RECTS = 100
+MAX_DIRTY_AREA = 0.5
+
+_fonts = {}
+_text_cache = OrderedDict()
+TEXT_CACHE_SIZE = 256
+
+def get_font(size):
+    """Police par défaut à la taille donnée, créée une seule fois."""
+    font = _fonts.get(size)
+    if font is None:
+        font = _fonts[size] = pygame.font.Font(None, size)
+    return font
+
+def render_text(text, size=36, color=(255, 255, 255)):
+    """Rendu de texte mis en cache par (taille, texte, couleur) : seul un nouveau texte est re-rendu."""
+    key = (size, text, color)
+    surface = _text_cache.get(key)
+    if surface is None:
+        surface = _text_cache[key] = get_font(size).render(text, True, color)
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surface
+
+_button_click = None
+
+def get_button_click():
+    """Son de clic partagé par tous les boutons and cartes, décodé une seule fois."""
+    global _button_click
+    if _button_click is None:
+        _button_click = pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'buttonclick.ogg')))
+        _button_click.set_volume(0.35)
+    return _button_click
+
+BUTTON_BORDER = 2
+# Changements de phase des rayures par seconde, quelle que soit la cadence d'images
+BUTTON_STRIPE_RATE = 3.0
+_button_frames = {}
+
+def get_button_frame(size, color, phase, segment_length=10):
+    """Fond and bordure sucre d'orge d'un bouton, pour l'une des deux phases de l'animation.
+
+    La surface déborde de BUTTON_BORDER pixels de chaque côté pour contenir les traits."""
+    key = (size, color, phase)
+    frame = _button_frames.get(key)
+    if frame is None:
+        width, height = size
+        frame = pygame.Surface((width + 2 * BUTTON_BORDER, height + 2 * BUTTON_BORDER), pygame.SRCALPHA)
+        rect = pygame.Rect(BUTTON_BORDER, BUTTON_BORDER, width, height)
+        pygame.draw.rect(frame, color, rect)
         rect_points = [
-            (self.rect.left, self.rect.top),
-            (self.rect.right, self.rect.top),
-            (self.rect.right, self.rect.bottom),
-            (self.rect.left, self.rect.bottom)
+            (rect.left, rect.top),
+            (rect.right, rect.top),
+            (rect.right, rect.bottom),
+            (rect.left, rect.bottom)
         ]
 
         for i in range(4):
             start_pos = rect_points[i]
             end_pos = rect_points[(i + 1) % 4]
             length = ((end_pos[0] - start_pos[0])**2 + (end_pos[1] - start_pos[1])**2)**0.5
-            num_segments = int(length / self.segment_length)
+            num_segments = int(length / segment_length)
 
             for j in range(num_segments):
                 start_ratio = j / num_segments
@@ -60,14 +111,37 @@ class Button:
                     start_pos[1] + (end_pos[1] - start_pos[1]) * end_ratio
                 )
 
-                color = (255, 0, 0) if (j + self.candy_cane_offset) % 2 >= 1 else (255, 255, 255)
-                pygame.draw.line(screen, color, seg_start, seg_end, 3)
+                color_index = (j + phase) % 2
+                pygame.draw.line(frame, (255, 0, 0) if color_index else (255, 255, 255), seg_start, seg_end, 3)
 
-        text_surface = self.font.render(self.text, True, (255, 255, 255))
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        frame = _button_frames[key] = frame.convert_alpha()
+    return frame
+
+class Button:
+    def __init__(self, x, y, width, height, text, color=(100, 100, 100)):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.text = text
+        self.color = color
+        self.font = get_font(36)
+        self.segment_length = 10
+        self.buttonClick = get_button_click()
+        self.rendered_text = None
+        self.text_surface = None
+        self.text_rect = None
 
-        self.candy_cane_offset = (self.candy_cane_offset + 0.05) % 2
+    def draw(self, screen):
+        # Phase tirée de l'horloge and non du nombre d'images : même vitesse à 60, 30 or 10 FPS.
+        # Deux phases seulement, donc deux images pré-rendues suffisent
+        phase = int(pygame.time.get_ticks() * BUTTON_STRIPE_RATE / 1000) % 2
+        frame = get_button_frame(self.rect.size, self.color, phase, self.segment_length)
+        rect = screen.blit(frame, (self.rect.x - BUTTON_BORDER, self.rect.y - BUTTON_BORDER))
+
+        if self.text != self.rendered_text:
+            self.text_surface = render_text(self.text)
+            self.text_rect = self.text_surface.get_rect(center=self.rect.center)
+            self.rendered_text = self.text
+        screen.blit(self.text_surface, self.text_rect)
+        return rect
 
     def is_clicked(self, pos):
         if self.rect.collidepoint(pos):
@@ -81,53 +155,36 @@ class Card:
         self.entity_type = entity_type
         self.entity_group = entity_group
         self.cost = cost
-        self.sprite_rect = pygame.Rect(0, 0, 100, 100)
-        self.buttonClick = pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'buttonclick.ogg')))
-        self.buttonClick.set_volume(0.35)
-
-    def draw(self, screen, cards_image, is_selected, can_afford):
-        if self.entity_group == 'plant':
-            sprite_y = 0
-            if self.entity_type == 'candycane':
-                sprite_x = 0
-            elif self.entity_type == 'peashooter':
-                sprite_x = 100
-            elif self.entity_type == 'icewall':
-                sprite_x = 200
-            else:
-                sprite_x = 300
-        else:
-            sprite_y = 100
-            if self.entity_type == 'basic':
-                sprite_x = 0
-            elif self.entity_type == 'cone':
-                sprite_x = 100
-            elif self.entity_type == 'bucket':
-                sprite_x = 200
-            else:
-                sprite_x = 300
-
-        self.sprite_rect = pygame.Rect(sprite_x, sprite_y, 100, 100)
-        scaled_surface = pygame.Surface((80, 100), pygame.SRCALPHA)
-        temp_surface = pygame.Surface((100, 100), pygame.SRCALPHA)
-        temp_surface.blit(cards_image, (0, 0), self.sprite_rect)
-        scaled_surface = pygame.transform.scale(temp_surface, (85, 100))
-        screen.blit(scaled_surface, self.rect)
+        self.buttonClick = get_button_click()
+        self.rendered_state = None
+        self.surface = None
+
+    def draw(self, screen, sprites, is_selected, can_afford):
+        state = (is_selected, can_afford)
+        if state != self.rendered_state:
+            self.surface = self.render(sprites, is_selected, can_afford)
+            self.rendered_state = state
+        return screen.blit(self.surface, self.rect)
+
+    def render(self, sprites, is_selected, can_afford):
+        """Compose la carte pour un état donné ; appelé seulement quand cet état change."""
+        surface = sprites[card_sprite_name(self.entity_group, self.entity_type)].copy()
+        local_rect = surface.get_rect()
 
         if is_selected:
             color = (255, 255, 0) if self.entity_group == 'plant' else (255, 0, 0)
-            pygame.draw.rect(screen, color, self.rect, 3)
+            pygame.draw.rect(surface, color, local_rect, 3)
 
         if not can_afford:
-            overlay = pygame.Surface((100, 100))
+            overlay = pygame.Surface(self.rect.size)
             overlay.fill((0, 0, 0))
             overlay.set_alpha(128)
-            screen.blit(overlay, self.rect)
+            surface.blit(overlay, (0, 0))
 
-        font = pygame.font.Font(None, 36)
-        cost_text = font.render(str(self.cost), True, (255, 255, 255))
-        cost_rect = cost_text.get_rect(center=(self.rect.centerx, self.rect.bottom - 20))
-        screen.blit(cost_text, cost_rect)
+        cost_text = render_text(str(self.cost))
+        cost_rect = cost_text.get_rect(center=(local_rect.centerx, local_rect.bottom - 20))
+        surface.blit(cost_text, cost_rect)
+        return surface
 
     def is_clicked(self, pos):
         if self.rect.collidepoint(pos):
@@ -136,7 +193,129 @@ class Card:
             return True
         return False
 
+class AssetLoader:
+    """Exécute des tâches de chargement sur un thread en arrière-plan and expose leur progression."""
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.results = {}
+        self.completed = 0
+        self.error = None
+        self.thread = threading.Thread(target=self.run)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def run(self):
+        try:
+            for name, job in self.jobs:
+                self.results[name] = job()
+                self.completed += 1
+        except Exception as e:
+            self.error = e
+
+    def progress(self):
+        return self.completed / len(self.jobs)
+
+    def is_done(self):
+        return self.error is not None or self.completed == len(self.jobs)
+
+    def wait(self):
+        self.thread.join()
+        if self.error:
+            raise self.error
+        return self.results
+
+class LayeredRenderer:
+    """Compose l'écran de jeu en couches : une couche statique (fond + plantes) recomposée
+    seulement quand les plantes changent, and des sprites dynamiques suivis par rectangles sales."""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+        self.static_layer = pygame.Surface(screen.get_size()).convert()
+        self.static_key = None
+        self.previous_rects = []
+        self.rects = []
+        self.needs_full_update = True
+        self.had_overlay = False
+        self.screen_area = screen.get_width() * screen.get_height()
+
+    def invalidate(self):
+        self.needs_full_update = True
+
+    def set_static(self, key, draw_static):
+        if key != self.static_key:
+            self.static_layer.blit(self.background, (0, 0))
+            draw_static(self.static_layer)
+            self.static_key = key
+            self.needs_full_update = True
+
+    def begin_frame(self, overlay=False):
+        # Un overlay plein écran (pause, fin de partie) impose un rafraîchissement complet,
+        # y compris à la frame qui suit sa disparition
+        if overlay or self.had_overlay:
+            self.needs_full_update = True
+        self.had_overlay = overlay
+
+        # Plateau chargé (rectangles nombreux, souvent superposés) : un seul blit plein écran
+        previous = self.previous_rects
+        if (len(previous) > MAX_DIRTY_RECTS
+                or sum(rect.w * rect.h for rect in previous) > self.screen_area * MAX_DIRTY_AREA):
+            self.needs_full_update = True
+
+        if self.needs_full_update:
+            self.screen.blit(self.static_layer, (0, 0))
+        else:
+            static = self.static_layer
+            self.screen.blits([(static, rect, rect) for rect in previous], False)
+        self.rects = []
+
+    def blit(self, surface, pos):
+        rect = self.screen.blit(surface, pos)
+        self.rects.append(rect)
+        return rect
+
+    def submit(self, batch):
+        self.rects.extend(batch.flush(self.screen))
+
+    def mark(self, rect):
+        self.rects.append(rect)
+
+    def end_frame(self):
+        if self.needs_full_update:
+            pygame.display.flip()
+            self.needs_full_update = False
+        else:
+            pygame.display.update(self.previous_rects + self.rects)
+        self.previous_rects = self.rects
+
+class SpriteBatch:
+    """Collecte les sprites d'une couche puis les envoie en un seul appel à Surface.blits.
+
+    Les sprites sont triés une fois par rangée (les rangées du bas recouvrent celles du
+    haut) and ceux entièrement hors de l'écran sont ignorés."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.items = []
+
+    def add(self, surface, pos, row=0):
+        self.items.append((row, surface, pos))
+
+    def flush(self, target):
+        items = self.items
+        self.items = []
+        items.sort(key=lambda item: item[0])
+        width, height = self.width, self.height
+        sequence = [(surface, pos) for _, surface, pos in items
+                    if pos[0] < width and pos[1] < height
+                    and pos[0] + surface.get_width() > 0 and pos[1] + surface.get_height() > 0]
+        return target.blits(sequence)
+
 class Snowflake:
+    sprites = {}
+
     def __init__(self, screen_width, screen_height):
         self.x = random.randint(0, screen_width)
         self.y = random.randint(-screen_height, 0)
@@ -145,14 +324,27 @@ class Snowflake:
         self.screen_width = screen_width
         self.screen_height = screen_height
 
-    def update(self):
-        self.y += self.speed
+    def update(self, frames=1.0):
+        # La vitesse est exprimée en pixels par image à 60 FPS
+        self.y += self.speed * frames
         if self.y > self.screen_height:
             self.y = random.randint(-self.screen_height, 0)
             self.x = random.randint(0, self.screen_width)
 
-    def draw(self, screen):
-        pygame.draw.circle(screen, (255, 255, 255), (int(self.x), int(self.y)), self.size)
+    @classmethod
+    def sprite(cls, size):
+        surface = cls.sprites.get(size)
+        if surface is None:
+            surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surface, (255, 255, 255), (size, size), size)
+            surface = cls.sprites[size] = surface.convert_alpha()
+        return surface
+
+    @staticmethod
+    def draw_all(screen, snowflakes):
+        sprite = Snowflake.sprite
+        screen.blits([(sprite(flake.size), (int(flake.x) - flake.size, int(flake.y) - flake.size))
+                      for flake in snowflakes], False)
 
 class Menu:
     def __init__(self, game):
@@ -164,6 +356,7 @@ class Menu:
         self.input_text = ""
         self.create_buttons()
         self.snowflakes = [Snowflake(800, 600) for _ in range(100)]
+        self.last_draw = None
 
     def update_buttons_volume(self):
         """Met à jour le volume de tous les boutons du menu"""
@@ -292,9 +485,12 @@ class Menu:
     def draw(self, screen):
         screen.fill((42, 21, 174))
 
+        now = time.time()
+        frames = min(6.0, (now - self.last_draw) * 60) if self.last_draw else 1.0
+        self.last_draw = now
         for snowflake in self.snowflakes:
-            snowflake.update()
-            snowflake.draw(screen)
+            snowflake.update(frames)
+        Snowflake.draw_all(screen, self.snowflakes)
 
         if self.current_menu == "main":
             self.play_button.draw(screen)
@@ -312,8 +508,7 @@ class Menu:
             self.back_button.draw(screen)
 
         elif self.current_menu == "private_room":
-            font = pygame.font.Font(None, 36)
-            text_surface = font.render(f"Code: {self.input_text}", True, (255, 255, 255))
+            text_surface = render_text(f"Code: {self.input_text}")
             screen.blit(text_surface, (300, 250))
             self.join_button.draw(screen)
             self.back_button.draw(screen)
@@ -330,11 +525,10 @@ class Menu:
             sfx_pos = self.sfx_volume_slider_rect.x + (self.sfx_volume_slider_rect.width * self.game.sfx_volume)
             pygame.draw.circle(screen, (255, 255, 255), (int(sfx_pos), self.sfx_volume_slider_rect.centery), 10)
 
-            font = pygame.font.Font(None, 36)
-            volume_text = font.render(f"Volume: {int(self.game.music_volume * 100)}%", True, (255, 255, 255))
+            volume_text = render_text(f"Volume: {int(self.game.music_volume * 100)}%")
             screen.blit(volume_text, (300, 300))
 
-            volume_text = font.render(f"Effets: {int(self.game.sfx_volume * 100)}%", True, (255, 255, 255))
+            volume_text = render_text(f"Effets: {int(self.game.sfx_volume * 100)}%")
             screen.blit(volume_text, (300, 375))
 
         pygame.display.flip()
@@ -346,6 +540,8 @@ class Game:
         self.screen = pygame.display.set_mode((800, 600))
         pygame.display.set_caption("Christmas Defense")
         self.clock = pygame.time.Clock()
+        self.profiler = FrameProfiler()
+        self.last_input_time = time.time()
         self.running = True
         self.state = 1
         self.sound_enabled = True
@@ -355,7 +551,11 @@ class Game:
         self.in_game = False
         self.tcp_client = None
         self.is_solo = False
+        from shared.game import Game as ServerGame
         self.game_state = None
+        # Données fixes de la partie (plantes disponibles, taille de grille) : celles du code
+        # partagé, remplacées par le message STATIC du serveur s'il arrive
+        self.static_state = ServerGame.static_data()
         self.game_instance = None
         self.last_zombie_spawn = 0
         self.selected_plant = 'candycane'
@@ -364,145 +564,127 @@ class Game:
         self.online_game_started = False
         self.last_update = time.time()
         self.server_tick_rate = 20
+        self.solo_step = 1 / 60
+        self.max_catch_up_steps = 5
+        self.accumulator = 0.0
+        self.simulation_time = 0.0
+        self.interpolation_delay = 0.1
+        self.zombie_buffer = SnapshotBuffer()
         self.is_attacker = False
         self.selected_zombie = 'basic'
         self.zombie_buttons = []
-        self.prev_game_state = None
-        self.prev_update_time = time.time()
+        self.prediction = None
+        self.network_inbox = deque()
         self.paused = False
         self.pause_start_time = 0
         self.total_pause_time = 0
         self.game_start_time = 0
 
+        self.assets_ready = False
+        assets_dir = resource_path(os.path.join('client', 'assets'))
+        self.loader = AssetLoader([
+            ('sprites', lambda: read_sprites(assets_dir)),
+            ('background', lambda: pygame.image.load(os.path.join(assets_dir, 'background.png'))),
+            ('sprinter', lambda: pygame.image.load(os.path.join(assets_dir, 'sprinter.png'))),
+            ('splat', lambda: pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'splat.ogg')))),
+            ('point', lambda: pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'points.ogg')))),
+        ])
+
+        # Les musiques sont lues en streaming par pygame.mixer.music plutôt que décodées en mémoire
+        self.menu_music = resource_path(os.path.join('client', 'music', 'Crazy_Dave.mp3'))
+        self.game_music = resource_path(os.path.join('client', 'music', 'Loonboon.mp3'))
+        self.lose_music = resource_path(os.path.join('client', 'music', 'losemusic.ogg'))
+        self.current_music = None
+
+        self.selected_plant = 'candycane'
+        self.plant_buttons = []
+
+        self.grid_start_x = 41
+        self.grid_start_y = 179
+        self.cell_size = 80
+
+        self.waiting_text = render_text("En attente d'un autre joueur...", 74)
+        self.waiting_rect = self.waiting_text.get_rect(center=(400, 300))
+
+        self.animations = AnimationStore()
+        self.animation_speed = 0.2
+
+        self.ICEWALL_HIT_DURATION = 0.3
+        self.ICEWALL_HIT_COOLDOWN = 1.0
+
+        self.plant_cards = []
+        self.zombie_cards = []
+
+        self.pause_button = Button(700, 20, 80, 40, "||")
+
+        self.replay_button = Button(200, 400, 200, 50, "Rejouer")
+        self.end_quit_button = Button(450, 400, 200, 50, "Quitter")
+
+    def finish_loading(self):
+        """Termine le chargement sur le thread principal : conversion au format de l'écran."""
+        assets = self.loader.wait()
+        self.sprites = convert_sprites(*assets['sprites'])
+
         self.images = {
-            'background': pygame.Surface((800, 600)),
+            'background': assets['background'].convert(),
             'grid_cell': pygame.Surface((80, 80)),
         }
-
-        self.images['background'] = pygame.image.load(resource_path(os.path.join('client', 'assets', 'background.png')))
         self.images['grid_cell'].fill((80, 140, 80))
-        self.images['sprinter'] = pygame.transform.scale(pygame.image.load(resource_path(os.path.join('client', 'assets', 'sprinter.png'))), (80, 140))
-        self.selected_plant = 'candycane'
-        self.plant_buttons = []
+        self.images['sprinter'] = pygame.transform.scale(assets['sprinter'], (80, 140)).convert_alpha()
 
-        candycane_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'candycane.png')))
-        self.images['candycane'] = pygame.Surface((80, 80), pygame.SRCALPHA)
-        self.images['candycane_ready'] = pygame.Surface((80, 80), pygame.SRCALPHA)
-        self.images['candycane'].blit(candycane_sprite, (0, 0), (0, 0, 80, 80))
-        self.images['candycane'] = pygame.transform.scale(self.images['candycane'], (100, 100))
-        self.images['candycane_ready'].blit(candycane_sprite, (0, 0), (80, 0, 160, 80))
-        self.images['candycane_ready'] = pygame.transform.scale(self.images['candycane_ready'], (100, 100))
+        self.images['candycane'] = self.sprites['candycane']
+        self.images['candycane_ready'] = self.sprites['candycane_ready']
 
-        icewall_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'icewall.png')))
         self.images['icewall'] = {}
         self.images['icewall_hit'] = {}
-        self.icewall_states = {}
 
         for health_state in range(3):
-            self.images['icewall'][health_state] = pygame.Surface((80, 120), pygame.SRCALPHA)
-            self.images['icewall'][health_state].blit(icewall_sprite, (0, 0), (0, health_state * 120, 80, 120))
-            self.images['icewall'][health_state] = pygame.transform.scale(self.images['icewall'][health_state], (120, 120))
-
-            self.images['icewall_hit'][health_state] = pygame.Surface((80, 120), pygame.SRCALPHA)
-            self.images['icewall_hit'][health_state].blit(icewall_sprite, (0, 0), (80, health_state * 120, 160, 120))
-            self.images['icewall_hit'][health_state] = pygame.transform.scale(self.images['icewall_hit'][health_state], (120, 120))
+            self.images['icewall'][health_state] = self.sprites[f'icewall_{health_state}']
+            self.images['icewall_hit'][health_state] = self.sprites[f'icewall_hit_{health_state}']
 
-        self.images['pea'] = pygame.transform.scale(pygame.image.load(resource_path(os.path.join('client', 'assets', 'snowball.png'))), (30, 30))
+        self.images['pea'] = self.sprites['pea']
         self.images['energy_icon'] = pygame.Surface((30, 30))
         self.images['energy_icon'].fill((255, 0, 0))
 
         self.images['shovel'] = pygame.Surface((60, 60))
         self.images['shovel'].fill((139, 69, 19))
 
-        self.menu_music = pygame.mixer.Sound(resource_path(os.path.join('client', 'music', 'Crazy_Dave.mp3')))
-        self.game_music = pygame.mixer.Sound(resource_path(os.path.join('client', 'music', 'Loonboon.mp3')))
-        self.lose_music = pygame.mixer.Sound(resource_path(os.path.join('client', 'music', 'losemusic.ogg')))
-        self.current_music = None
+        self.images['peashooter'] = [self.sprites[f'peashooter_{i}'] for i in range(PEASHOOTER_FRAMES)]
 
-        self.menu_music.set_volume(self.music_volume if self.sound_enabled else 0)
-        self.game_music.set_volume(self.music_volume if self.sound_enabled else 0)
-        self.lose_music.set_volume(self.music_volume if self.sound_enabled else 0)
-
-        self.splat = pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'splat.ogg')))
-        self.point = pygame.mixer.Sound(resource_path(os.path.join('client', 'soundEffect', 'points.ogg')))
+        self.splat = assets['splat']
+        self.point = assets['point']
 
         self.splat.set_volume(self.sfx_volume if self.sound_enabled else 0)
         self.point.set_volume(self.sfx_volume if self.sound_enabled else 0)
 
-        self.grid_start_x = 41
-        self.grid_start_y = 179
-        self.cell_size = 80
-
-        self.waiting_font = pygame.font.Font(None, 74)
-        self.waiting_text = self.waiting_font.render("En attente d'un autre joueur...", True, (255, 255, 255))
-        self.waiting_rect = self.waiting_text.get_rect(center=(400, 300))
-
-        self.zombie_animations = {}
-        self.animation_speed = 0.2
-
-        self.ICEWALL_HIT_DURATION = 0.3
-        self.ICEWALL_HIT_COOLDOWN = 1.0
-
-        peashooter_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'shooter.png')))
-        self.images['peashooter'] = []
-        for i in range(5):
-            frame = pygame.Surface((80, 80), pygame.SRCALPHA)
-            frame.blit(peashooter_sprite, (0, 0), (i * 80, 0, 80, 80))
-            frame = pygame.transform.scale(frame, (120, 120))
-            self.images['peashooter'].append(frame)
-
-        self.peashooter_states = {}
-
-        self.cards_image = pygame.image.load(resource_path(os.path.join('client', 'assets', 'cartes.png')))
-        self.plant_cards = []
-        self.zombie_cards = []
-
-        self.basic_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'basic.png')))
-        self.cone_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'cone.png')))
-        self.bucket_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'krampus.png')))
-
-        self.basic_attack_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'basic_att.png')))
-        self.cone_attack_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'cone_att.png')))
-        self.bucket_attack_sprite = pygame.image.load(resource_path(os.path.join('client', 'assets', 'krampus_att.png')))
+        self.zombie_frames = self.build_zombie_frames()
 
-        self.zombie_attack_states = {}
+        self.hud_panels = {name: self.sprites[f'hud_{name}'] for name in ('sun', 'time', 'energy')}
 
-        self.images['basic'] = []
-        self.images['cone'] = []
-        self.images['bucket'] = []
+        glow = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+        pygame.draw.circle(glow, (255, 215, 0, 128), (self.cell_size // 2, self.cell_size // 2), self.cell_size // 2)
+        self.glow = glow.convert_alpha()
 
-        for i in range(4):
-            frame = pygame.Surface((80, 80), pygame.SRCALPHA)
-            frame.blit(self.basic_sprite, (0, 0), (i * 80, 0, 80, 80))
-            frame = pygame.transform.scale(frame, (120, 140))
-            self.images['basic'].append(frame)
-
-        for i in range(3):
-            frame = pygame.Surface((80, 80), pygame.SRCALPHA)
-            frame.blit(self.cone_sprite, (0, 0), (i * 80, 0, 80, 80))
-            frame = pygame.transform.scale(frame, (130, 140))
-            self.images['cone'].append(frame)
-
-            frame = pygame.Surface((80, 140), pygame.SRCALPHA)
-            frame.blit(self.bucket_sprite, (0, 0), (i * 80, 0, 80, 140))
-            frame = pygame.transform.scale(frame, (130, 130))
-            self.images['bucket'].append(frame)
-
-        self.pause_button = Button(700, 20, 80, 40, "||")
+        self.renderer = LayeredRenderer(self.screen, self.images['background'])
+        self.sprite_batch = SpriteBatch(*self.screen.get_size())
+        self.assets_ready = True
 
-        self.replay_button = Button(200, 400, 200, 50, "Rejouer")
-        self.end_quit_button = Button(450, 400, 200, 50, "Quitter")
-
-        self.interface_cards = pygame.image.load(resource_path(os.path.join('client', 'assets', 'card.png')))
-        self.interface_cards = pygame.transform.scale(self.interface_cards, (160, 140))
+    def draw_loading_screen(self):
+        self.screen.fill((42, 21, 174))
+        text = render_text("Chargement...", 48)
+        self.screen.blit(text, text.get_rect(center=(400, 270)))
+        bar = pygame.Rect(250, 310, 300, 20)
+        pygame.draw.rect(self.screen, (100, 100, 100), bar)
+        pygame.draw.rect(self.screen, (255, 255, 255), (bar.x, bar.y, int(bar.width * self.loader.progress()), bar.height))
+        pygame.draw.rect(self.screen, (255, 255, 255), bar, 2)
+        pygame.display.flip()
 
     def play_music(self, music):
         if self.current_music != music:
-            if self.current_music:
-                self.current_music.stop()
-            music.play(-1)
+            pygame.mixer.music.load(music)
+            pygame.mixer.music.play(-1)
             self.current_music = music
-            self.current_music.set_volume(self.music_volume if self.sound_enabled else 0)
+            pygame.mixer.music.set_volume(self.music_volume if self.sound_enabled else 0)
 
     def play_sound_effect(self, sound):
         if self.sound_enabled:
@@ -512,7 +694,7 @@ class Game:
     def toggle_sound(self):
         self.sound_enabled = not self.sound_enabled
         if self.current_music:
-            self.current_music.set_volume(self.music_volume if self.sound_enabled else 0)
+            pygame.mixer.music.set_volume(self.music_volume if self.sound_enabled else 0)
         for sound in [self.splat, self.point]:
             sound.set_volume(self.sfx_volume if self.sound_enabled else 0)
             self.set_sfx_volume(self.sfx_volume)
@@ -520,7 +702,7 @@ class Game:
     def set_volume(self, volume):
         self.music_volume = max(0.0, min(1.0, volume))
         if self.sound_enabled and self.current_music:
-            self.current_music.set_volume(self.music_volume)
+            pygame.mixer.music.set_volume(self.music_volume)
 
     def set_sfx_volume(self, volume):
         self.sfx_volume = max(0.0, min(1.0, volume))
@@ -546,7 +728,7 @@ class Game:
         x, y = 50, 35
         current_sun = self.game_state.get('sun_points', 0) if self.game_state else 0
 
-        for plant_type in self.game_state.get('available_plants', []):
+        for plant_type in self.static_state.get('available_plants', []):
             cost = PLANT_TYPES[plant_type]['cost']
             card = Card(x, y, plant_type, 'plant', cost)
             card.buttonClick.set_volume(self.sfx_volume if self.sound_enabled else 0)
@@ -574,26 +756,21 @@ class Game:
         self.zombie_cards.append(('dead', dead_card))
 
     def draw_game(self):
-        self.screen.blit(self.images['background'], (0, 0))
-
-        font = pygame.font.Font(None, 36)
+        game_over = bool(self.game_state and self.game_state.get('game_over', False))
+        if self.game_state:
+            self.animations.sync(self.game_state)
+            self.draw_plants()
+        self.renderer.begin_frame(overlay=game_over or self.paused)
 
-        plant_energy_card = pygame.Surface((160, 47), pygame.SRCALPHA)
-        plant_energy_card.blit(self.interface_cards, (0, 0), (0, 0, 160, 47))
-        plant_energy_card = pygame.transform.scale(plant_energy_card, (170, 47))
-        self.screen.blit(plant_energy_card, (410, 35))
+        self.renderer.blit(self.hud_panels['sun'], (410, 35))
 
         if not self.is_attacker:
             sun_points = self.game_state.get('sun_points', 0) if self.game_state else 0
-            sun_text = font.render(f"{sun_points}", True, (255, 255, 255))
-            self.screen.blit(sun_text, (510, 47))
+            self.renderer.blit(render_text(f"{sun_points}"), (510, 47))
 
-        time_card = pygame.Surface((160, 47), pygame.SRCALPHA)
-        time_card.blit(self.interface_cards, (0, 0), (0, 47, 160, 94))
-        time_card = pygame.transform.scale(time_card, (170, 47))
-        self.screen.blit(time_card, (410, 85))
+        self.renderer.blit(self.hud_panels['time'], (410, 85))
 
-        if self.game_state and self.game_state.get('game_over', False):
+        if game_over:
             elapsed_time = max(0, int(self.game_state.get('end_time', time.time() - self.game_start_time)))
         else:
             current_time = time.time()
@@ -604,42 +781,36 @@ class Game:
 
         minutes = elapsed_time // 60
         seconds = elapsed_time % 60
-        time_text = font.render(f"{minutes:02d}:{seconds:02d}", True, (255, 255, 255))
-        self.screen.blit(time_text, (495, 97))
+        self.renderer.blit(render_text(f"{minutes:02d}:{seconds:02d}"), (495, 97))
 
         if self.is_attacker:
-            zombie_energy_card = pygame.Surface((160, 47), pygame.SRCALPHA)
-            zombie_energy_card.blit(self.interface_cards, (0, 0), (0, 94, 160, 140))
-            zombie_energy_card = pygame.transform.scale(zombie_energy_card, (170, 47))
-            self.screen.blit(zombie_energy_card, (410, 35))
+            self.renderer.blit(self.hud_panels['energy'], (410, 35))
 
             zombie_energy = self.game_state.get('energy', 0) if self.game_state else 0
-            energy_text = font.render(f"{zombie_energy}", True, (255, 255, 255))
-            self.screen.blit(energy_text, (510, 47))
+            self.renderer.blit(render_text(f"{zombie_energy}"), (510, 47))
 
         self.draw_buttons()
 
         if self.game_state:
-            self.draw_plants()
             self.draw_projectiles()
             self.draw_zombies()
 
         self.draw_end_game_message()
 
         if self.is_solo:
-            self.pause_button.draw(self.screen)
+            self.renderer.mark(self.pause_button.draw(self.screen))
 
     def draw_plants(self):
-        """Dessine les plantes sur la grille."""
+        """Met à jour la couche statique des plantes si leur apparence a changé."""
+        sprites = []
         for plant in self.game_state.get('plants', []):
             x = self.grid_start_x + (plant['col'] * self.cell_size) - 15
             y = self.grid_start_y + (plant['row'] * self.cell_size) - 15
-
+            glow = False
 
             if plant['type'] == 'candycane':
                 plant_image = self.images['candycane_ready'] if plant.get('ready_to_harvest', False) else self.images['candycane']
-                if plant.get('ready_to_harvest', False):
-                    self.draw_glow(x, y)
+                glow = plant.get('ready_to_harvest', False)
             elif plant['type'] == 'icewall':
                 plant_image = self.get_icewall_image(plant)
                 y -= 20
@@ -648,75 +819,74 @@ class Game:
                 plant_image = self.get_peashooter_image(plant)
             else:
                 continue
-            self.screen.blit(plant_image, (x, y))
+            sprites.append((plant_image, (x, y), glow))
 
-    def draw_zombies(self):
-        """Dessine les zombies avec interpolation."""
-        current_time = time.time()
-        alpha = min(1.0, (current_time - self.prev_update_time) * self.server_tick_rate)
-
-        if self.prev_game_state:
-            prev_zombies = {(z.get('id', f"{z['row']}_{z['col']}"), z['row']): z for z in self.prev_game_state.get('zombies', [])}
-            current_zombies = {(z.get('id', f"{z['row']}_{z['col']}"), z['row']): z for z in self.game_state.get('zombies', [])}
-
-            for (z_id, row), zombie in current_zombies.items():
-                prev_zombie = prev_zombies.get((z_id, row))
-                if prev_zombie:
-                    x, y = self.interpolate_zombie_position(prev_zombie, zombie, alpha)
-                    if prev_zombie['type'] == 'cone':
-                        y -= 20
-                    elif prev_zombie['type'] == 'bucket':
-                        y -= 20
-                else:
-                    x = self.grid_start_x + (zombie['col'] * self.cell_size) + 5
-                    y = self.grid_start_y + ((zombie['row'] - 1) * self.cell_size)
+        key = tuple((id(image), pos, glow) for image, pos, glow in sprites)
+        self.renderer.set_static(key, lambda layer: self.blit_plants(layer, sprites))
 
-                zombie_image = self.get_zombie_image(zombie, z_id)
-                self.screen.blit(zombie_image, (x, y))
-        else:
-            for zombie in self.game_state.get('zombies', []):
-                x = self.grid_start_x + (zombie['col'] * self.cell_size) + 5
-                y = self.grid_start_y + ((zombie['row'] - 1) * self.cell_size)
-                zombie_image = self.get_zombie_image(zombie)
-                self.screen.blit(zombie_image, (x, y))
+    def blit_plants(self, surface, sprites):
+        sequence = []
+        for plant_image, (x, y), glow in sprites:
+            if glow:
+                sequence.append((self.glow, (x + 15, y + 15)))
+            sequence.append((plant_image, (x, y)))
+        surface.blits(sequence, False)
+
+    def draw_zombies(self):
+        """Dessine les zombies à leur position interpolée dans le tampon de snapshots."""
+        positions = self.zombie_buffer.sample(time.time())
+        position = self.zombie_buffer.position
+        batch = self.sprite_batch
+        for zombie in self.game_state.get('zombies', []):
+            col = position(positions, zombie['id'], zombie['x']) / POSITION_SCALE
+            x = self.grid_start_x + (col * self.cell_size) + 5
+            y = self.grid_start_y + (zombie['row'] * self.cell_size) - 50
+            if zombie['type'] in ('cone', 'bucket'):
+                y -= 20
+            batch.add(self.get_zombie_image(zombie), (x, y), zombie['row'])
+        self.renderer.submit(batch)
 
     def draw_projectiles(self):
         """Dessine les projectiles."""
+        pea = self.images['pea']
+        batch = self.sprite_batch
         for proj in self.game_state.get('projectiles', []):
-            x = self.grid_start_x + (proj['col'] * self.cell_size) + 55
+            x = self.grid_start_x + (proj['x'] * self.cell_size / POSITION_SCALE) + 55
             y = self.grid_start_y + (proj['row'] * self.cell_size) + 25
-            self.screen.blit(self.images['pea'], (x, y))
+            batch.add(pea, (x, y), proj['row'])
+        self.renderer.submit(batch)
 
     def draw_buttons(self):
         """Dessine les cartes pour l'attaquant ou le défenseur."""
         if self.is_attacker:
-            self.create_zombie_buttons()
+            if not self.zombie_cards:
+                self.create_zombie_buttons()
             current_energy = self.game_state.get('energy', 0) if self.game_state else 0
             for zombie_type, card in self.zombie_cards:
                 cost = 0 if zombie_type == 'dead' else ZOMBIE_TYPES[zombie_type]['cost']
-                card.draw(self.screen, self.cards_image,
+                self.renderer.mark(card.draw(self.screen, self.sprites,
                         zombie_type == self.selected_zombie,
-                        current_energy >= cost)
+                        current_energy >= cost))
         else:
-            self.create_plant_buttons()
+            if not self.plant_cards:
+                self.create_plant_buttons()
             current_sun = self.game_state.get('sun_points', 0) if self.game_state else 0
             for plant_type, card in self.plant_cards:
                 cost = 0 if plant_type == 'shovel' else PLANT_TYPES[plant_type]['cost']
-                card.draw(self.screen, self.cards_image,
+                self.renderer.mark(card.draw(self.screen, self.sprites,
                         plant_type == self.selected_plant,
-                        current_sun >= cost)
+                        current_sun >= cost))
 
     def draw_end_game_message(self):
         """Dessine le message de fin de jeu si nécessaire."""
         if self.game_state and self.game_state.get('game_over', False):
-            font = pygame.font.Font(None, 74)
             if self.is_solo:
-                text = font.render("GAME OVER", True, (255, 0, 0))
+                text = render_text("GAME OVER", 74, (255, 0, 0))
             else:
                 if self.is_attacker:
-                    text = font.render("VICTORY!", True, (0, 255, 0)) if self.game_state.get('winner') == 'att' else None
+                    text = render_text("VICTORY!", 74, (0, 255, 0)) if self.game_state.get('winner') == 'att' else None
                 else:
-                    text = font.render("GAME OVER", True, (255, 0, 0)) if self.game_state.get('winner') == 'att' else None
+                    text = render_text("GAME OVER", 74, (255, 0, 0)) if self.game_state.get('winner') == 'att' else None
 
             if text:
                 overlay = pygame.Surface((800, 600))
@@ -730,26 +900,11 @@ class Game:
                 self.replay_button.draw(self.screen)
                 self.end_quit_button.draw(self.screen)
 
-    def draw_glow(self, x, y):
-        """Dessine un effet de lueur autour d'une plante prête à être récoltée."""
-        glow_surface = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
-        pygame.draw.circle(glow_surface, (255, 215, 0, 128), (self.cell_size // 2, self.cell_size // 2), self.cell_size // 2)
-        self.screen.blit(glow_surface, (x + 15, y + 15))
-
-
     def get_icewall_image(self, plant):
         """Renvoie l'image appropriée pour une IceWall, avec animation and état de santé."""
         current_time = time.time()
-        plant_key = (plant['row'], plant['col'])
 
-        if plant_key not in self.icewall_states:
-            self.icewall_states[plant_key] = {
-                'hit_time': 0,
-                'last_hit': 0,
-                'is_being_eaten': False
-            }
-
-        state = self.icewall_states[plant_key]
+        state = self.animations.icewall(plant['id'])
 
         health_ratio = plant.get('health', 100) / PLANT_TYPES['icewall']['health']
         if health_ratio > 0.66:
@@ -760,16 +915,16 @@ class Game:
             health_state = 2
 
         is_being_eaten = any(
-            zombie['row'] == plant['row'] and abs(zombie['col'] - plant['col']) <= 1
+            zombie['row'] == plant['row'] and abs(zombie['x'] - plant['col'] * POSITION_SCALE) <= POSITION_SCALE
             for zombie in self.game_state.get('zombies', [])
         )
 
         if not self.paused and not self.game_state.get('game_over', False):
-            if is_being_eaten and (current_time - state['last_hit'] > self.ICEWALL_HIT_COOLDOWN):
-                state['hit_time'] = current_time
-                state['last_hit'] = current_time
+            if is_being_eaten and (current_time - state.last_hit > self.ICEWALL_HIT_COOLDOWN):
+                state.hit_time = current_time
+                state.last_hit = current_time
                 return self.images['icewall_hit'][health_state]
-            elif current_time - state['hit_time'] < self.ICEWALL_HIT_DURATION:
+            elif current_time - state.hit_time < self.ICEWALL_HIT_DURATION:
                 return self.images['icewall_hit'][health_state]
 
         return self.images['icewall'][health_state]
@@ -777,112 +932,74 @@ class Game:
 
     def get_peashooter_image(self, plant):
         """Renvoie l'image animée d'un Peashooter selon son état."""
-        plant_key = (plant['row'], plant['col'])
         current_time = time.time()
 
         if not isinstance(self.images['peashooter'], list):
             return self.images['peashooter']
 
-        if plant_key not in self.peashooter_states:
-            self.peashooter_states[plant_key] = {
-                'shooting': False,
-                'frame': 0,
-                'last_update': current_time
-            }
-
-        state = self.peashooter_states[plant_key]
+        state = self.animations.peashooter(plant['id'])
         is_shooting = plant.get('shooting', False)
 
         if not self.paused and not self.game_state.get('game_over', False):
-            if is_shooting and not state['shooting']:
-                state['shooting'] = True
-                state['frame'] = 0
-                state['last_update'] = current_time
-            elif state['shooting']:
-                if current_time - state['last_update'] > 0.1:
-                    state['frame'] = (state['frame'] + 1) % len(self.images['peashooter'])
-                    state['last_update'] = current_time
-                    if state['frame'] == 0:
-                        state['shooting'] = False
-
-        if not state['shooting']:
+            if is_shooting and not state.shooting:
+                state.shooting = True
+                state.frame = 0
+                state.last_update = current_time
+            elif state.shooting:
+                if current_time - state.last_update > 0.1:
+                    state.frame = (state.frame + 1) % len(self.images['peashooter'])
+                    state.last_update = current_time
+                    if state.frame == 0:
+                        state.shooting = False
+
+        if not state.shooting:
             return self.images['peashooter'][0]
 
-        return self.images['peashooter'][state['frame']]
+        return self.images['peashooter'][state.frame]
 
 
-    def get_zombie_image(self, zombie, z_id=None):
+    def get_zombie_image(self, zombie):
         """Renvoie l'image appropriée pour un zombie, avec gestion de l'animation and de la santé."""
-        if z_id and z_id not in self.zombie_animations:
-            self.zombie_animations[z_id] = {'frame': 0, 'timer': time.time()}
-            self.zombie_attack_states[z_id] = {'attacking': False, 'frame': 0, 'last_update': time.time()}
-
-        anim = self.zombie_animations.get(z_id, {'frame': 0, 'timer': time.time()})
-        attack_state = self.zombie_attack_states.get(z_id, {'attacking': False, 'frame': 0, 'last_update': time.time()})
+        anim = self.animations.zombie(zombie['id'])
 
         is_attacking = False
         if not self.paused and not self.game_state.get('game_over', False):
             if zombie['is_eating']:
                 is_attacking = True
 
-        attack_state['attacking'] = is_attacking
-
         current_time = time.time()
         if not self.paused and not self.game_state.get('game_over', False):
             if is_attacking:
-                if current_time - attack_state['last_update'] > self.animation_speed:
-                    attack_state['frame'] = (attack_state['frame'] + 1) % 3
-                    attack_state['last_update'] = current_time
+                if current_time - anim.attack_timer > self.animation_speed:
+                    anim.attack_frame = (anim.attack_frame + 1) % 3
+                    anim.attack_timer = current_time
             else:
-                if current_time - anim['timer'] > self.animation_speed:
-                    anim['frame'] = (anim['frame'] + 1) % len(self.images[zombie['type']])
-                    anim['timer'] = current_time
+                if current_time - anim.walk_timer > self.animation_speed:
+                    anim.walk_frame = (anim.walk_frame + 1) % ZOMBIE_WALK_FRAMES[zombie['type']]
+                    anim.walk_timer = current_time
 
 
         health_ratio = zombie.get('health', 100) / ZOMBIE_TYPES[zombie['type']]['health']
         if health_ratio > 0.66:
-            sprite_y = 0
+            health_state = 0
         elif health_ratio > 0.33:
-            sprite_y = 80
-        else:
-            sprite_y = 160
-
-        frame = pygame.Surface((80, 80), pygame.SRCALPHA)
-
-        if is_attacking:
-            if zombie['type'] == 'basic':
-                frame.blit(self.basic_attack_sprite, (0, 0), (attack_state['frame'] * 80, sprite_y, 80, 80))
-                frame = pygame.transform.scale(frame, (130, 130))
-            elif zombie['type'] == 'cone':
-                frame.blit(self.cone_attack_sprite, (0, 0), (attack_state['frame'] * 80, sprite_y, 80, 80))
-                frame = pygame.transform.scale(frame, (130, 140))
-            elif zombie['type'] == 'bucket':
-                frame.blit(self.bucket_attack_sprite, (0, 0), (attack_state['frame'] * 80, sprite_y, 80, 140))
-                frame = pygame.transform.scale(frame, (130, 130))
+            health_state = 1
         else:
-            if zombie['type'] == 'basic':
-                frame.blit(self.basic_sprite, (0, 0), (anim['frame'] * 80, sprite_y, 80, 80))
-                frame = pygame.transform.scale(frame, (130, 130))
-            elif zombie['type'] == 'cone':
-                frame.blit(self.cone_sprite, (0, 0), (anim['frame'] * 80, sprite_y, 80, 80))
-                frame = pygame.transform.scale(frame, (130, 140))
-            elif zombie['type'] == 'bucket':
-                frame.blit(self.bucket_sprite, (0, 0), (anim['frame'] * 80, sprite_y, 80, 140))
-                frame = pygame.transform.scale(frame, (130, 140))
-
-        return frame
-
-
-    def interpolate_zombie_position(self, prev_zombie, curr_zombie, alpha):
-        """Interpole la position d'un zombie entre son état précédent and actuel."""
-        prev_col = prev_zombie['col']
-        curr_col = curr_zombie['col']
-        interp_col = prev_col + (curr_col - prev_col) * alpha
+            health_state = 2
 
-        x = self.grid_start_x + (interp_col * self.cell_size) + 5
-        y = self.grid_start_y + ((curr_zombie['row']) * self.cell_size) - 50
-        return x, y
+        frame_index = anim.attack_frame if is_attacking else anim.walk_frame
+        return self.zombie_frames[(zombie['type'], is_attacking, frame_index, health_state)]
 
+    def build_zombie_frames(self):
+        """Indexe les images de zombie pré-calculées par (type, attaque, frame, état de santé)."""
+        frames = {}
+        for (zombie_type, mode), (_, frame_count, _, _) in ZOMBIE_SHEETS.items():
+            attacking = mode == 'attack'
+            for frame_index in range(frame_count):
+                for health_state in range(3):
+                    name = zombie_sprite_name(zombie_type, attacking, frame_index, health_state)
+                    frames[(zombie_type, attacking, frame_index, health_state)] = self.sprites[name]
+        return frames
 
     def draw_pause_menu(self):
         overlay = pygame.Surface((800, 600))
@@ -898,9 +1015,8 @@ class Game:
             self.menu.pause_options_button.draw(self.screen)
             self.menu.quit_to_menu_button.draw(self.screen)
         else:
-            font = pygame.font.Font(None, 36)
-            music_text = font.render(f"Volume Musique: {int(self.music_volume * 100)}%", True, (255, 255, 255))
-            sfx_text = font.render(f"Volume Effets: {int(self.sfx_volume * 100)}%", True, (255, 255, 255))
+            music_text = render_text(f"Volume Musique: {int(self.music_volume * 100)}%")
+            sfx_text = render_text(f"Volume Effets: {int(self.sfx_volume * 100)}%")
 
             pygame.draw.rect(self.screen, (100, 100, 100), self.menu.volume_slider_rect2)
             pygame.draw.rect(self.screen, (100, 100, 100), self.menu.sfx_volume_slider_rect)
@@ -915,39 +1031,114 @@ class Game:
             self.menu.back_to_main_button.draw(self.screen)
 
     def render(self):
-        if self.in_game:
-            self.screen.fill((0, 0, 0))
+        if not self.assets_ready:
+            self.draw_loading_screen()
+        elif self.in_game:
             if not self.is_solo and not self.online_game_started:
+                self.screen.fill((0, 0, 0))
                 self.screen.blit(self.waiting_text, self.waiting_rect)
                 dots = "." * (int(time.time() * 2) % 4)
-                dots_text = self.waiting_font.render(dots, True, (255, 255, 255))
+                dots_text = render_text(dots, 74)
                 dots_rect = dots_text.get_rect(midleft=self.waiting_rect.midright)
                 self.screen.blit(dots_text, dots_rect)
+                pygame.display.flip()
+                self.renderer.invalidate()
             else:
                 self.draw_game()
                 if self.paused and self.is_solo:
                     self.draw_pause_menu()
-            pygame.display.flip()
+                if self.profiler.visible:
+                    self.renderer.mark(self.profiler.draw(self.screen))
+                self.renderer.end_frame()
+                return
         else:
             self.menu.draw(self.screen)
+            self.renderer.invalidate()
+
+        if self.profiler.visible:
+            pygame.display.update(self.profiler.draw(self.screen))
 
     def reset_game_state(self):
         """Réinitialise l'état du jeu"""
+        from shared.game import Game as ServerGame
         self.game_state = None
+        self.static_state = ServerGame.static_data()
         self.game_instance = None
         self.is_attacker = False
         self.online_game_started = False
         self.plant_buttons = []
         self.zombie_buttons = []
+        self.plant_cards = []
+        self.zombie_cards = []
         self.selected_plant = 'candycane'
         self.selected_zombie = 'basic'
-        self.prev_game_state = None
+        self.prediction = None
+        self.network_inbox.clear()
+        self.zombie_buffer.clear()
         self.last_update = time.time()
-        self.prev_update_time = time.time()
-        self.zombie_animations = {}
+        self.animations.clear()
         self.pause_start_time = 0
         self.total_pause_time = 0
 
+    def process_network_messages(self):
+        """Applique, sur le thread principal, les messages reçus depuis la dernière image."""
+        count = len(self.network_inbox)
+        if not count:
+            return
+        messages = [self.network_inbox.popleft() for _ in range(count)]
+        # Seul le dernier snapshot d'une rafale compte : les précédents seraient écrasés aussitôt
+        last_snapshot = max((i for i, (kind, _) in enumerate(messages) if kind == "SNAPSHOT"), default=-1)
+
+        changed = False
+        for i, (kind, payload) in enumerate(messages):
+            if kind == "STATE":
+                self.state = payload
+                if payload == 1:
+                    from shared.game import Game as ServerGame
+                    self.game_instance = ServerGame(is_solo=False)
+                    self.prediction = Prediction()
+                    changed = True
+            elif kind == "START":
+                self.online_game_started = True
+                self.last_update = time.time()
+            elif kind == "ROLE":
+                self.is_attacker = (payload == "att")
+            elif kind == "STATIC":
+                self.static_state = payload
+                self.plant_cards = []
+            elif kind == "GAME_STATE":
+                self.game_state = payload
+                changed = False
+            elif not self.game_instance:
+                continue
+            elif kind == "SNAPSHOT":
+                received_at, snapshot = payload
+                self.zombie_buffer.push(received_at, snapshot['zombies'])
+                if i == last_snapshot and self.prediction:
+                    client_id = self.tcp_client.client_id if self.tcp_client else None
+                    self.game_instance = self.prediction.reconcile(snapshot, client_id)
+                    changed = True
+            elif kind == "ACK":
+                if self.prediction and self.prediction.acknowledge(*payload):
+                    self.game_instance = self.prediction.reconcile()
+                    changed = True
+            elif kind == "ACTION":
+                # Action d'un autre joueur, déjà validée par le serveur
+                if self.game_instance.apply_action(payload):
+                    changed = True
+                    if payload.startswith("HARVEST_SUNFLOWER:"):
+                        self.play_sound_effect(self.point)
+
+        if changed:
+            self.game_state = self.game_instance.get_game_state()
+
+    def send_action(self, action):
+        """Applique l'action du joueur localement sans attendre le serveur, puis l'envoie."""
+        success, message = self.prediction.predict(self.game_instance, action)
+        self.game_state = self.game_instance.get_game_state()
+        self.tcp_client.udp_client.send_message(message)
+        return success
+
     def set_tcp_client(self, client):
         self.tcp_client = client
 
@@ -969,13 +1160,20 @@ class Game:
         self.in_game = True
         self.state = 1
         self.game_instance = ServerGame(is_solo=True)
+        self.static_state = ServerGame.static_data()
         self.game_state = self.game_instance.get_game_state()
+        # La simulation locale avance à chaque image : rien à attendre ni à extrapoler
+        # Les zombies sont affichés entre les deux derniers pas de simulation
+        self.zombie_buffer = SnapshotBuffer(delay=self.solo_step, max_extrapolation=0)
         self.play_music(self.game_music)
         self.game_start_time = time.time()
         self.last_update = self.game_start_time
+        self.simulation_time = self.game_start_time
+        self.accumulator = 0.0
 
     def start_online_mode(self):
         self.is_solo = False
+        self.zombie_buffer = SnapshotBuffer(self.interpolation_delay)
         try:
             self.tcp_client = TCPClient('127.0.0.1', 12345, self)
             self.tcp_client.connect()
@@ -984,7 +1182,17 @@ class Game:
             self.menu.current_menu = "main"
 
     def update(self):
+        if not self.assets_ready:
+            if self.loader.is_done():
+                self.finish_loading()
+            return
+
+        self.process_network_messages()
+
         if self.paused:
+            # Le temps passé en pause ne doit pas être rattrapé à la reprise
+            if self.is_solo:
+                self.last_update = time.time()
             return
 
         if self.game_state and self.game_state.get('game_over', False):
@@ -998,20 +1206,10 @@ class Game:
         delta_time = current_time - self.last_update
 
         if self.is_solo and self.game_instance:
-            self.prev_game_state = self.game_state
-            self.prev_update_time = current_time
-            self.game_instance.update(1/60, current_time)
-
-            if hasattr(self.game_instance, 'last_hit') and self.game_instance.last_hit:
-                self.play_sound_effect(self.splat)
-                self.game_instance.last_hit = False
-
-            self.game_state = self.game_instance.get_game_state()
+            self.update_solo(current_time)
 
         elif self.online_game_started and self.game_instance:
             if delta_time >= 1.0/self.server_tick_rate:
-                self.prev_game_state = self.game_state
-                self.prev_update_time = current_time
                 self.game_instance.update(delta_time)
                 if hasattr(self.game_instance, 'last_hit') and self.game_instance.last_hit:
                     self.play_sound_effect(self.splat)
@@ -1022,12 +1220,78 @@ class Game:
             else:
                 time.sleep(0.001)
 
+    def update_solo(self, current_time):
+        """Avance la simulation solo par pas fixes, quelle que soit la durée de l'image.
+
+        Le retard accumulé est rattrapé en `max_catch_up_steps` pas au plus ; au-delà
+        (machine trop lente, fenêtre déplacée) le jeu ralentit au lieu de geler l'affichage."""
+        self.accumulator += current_time - self.last_update
+        self.last_update = current_time
+
+        steps = min(int(self.accumulator / self.solo_step), self.max_catch_up_steps)
+        if steps == self.max_catch_up_steps:
+            self.accumulator = min(self.accumulator, (steps + 1) * self.solo_step)
+
+        for _ in range(steps):
+            self.accumulator -= self.solo_step
+            self.simulation_time += self.solo_step
+            self.game_instance.update(self.solo_step, self.simulation_time)
+            # Horodaté en temps réel : l'instant où ce pas aurait dû avoir lieu
+            step_state = self.game_instance.get_game_state()
+            self.zombie_buffer.push(current_time - self.accumulator, step_state['zombies'])
+
+        if steps:
+            if hasattr(self.game_instance, 'last_hit') and self.game_instance.last_hit:
+                self.play_sound_effect(self.splat)
+                self.game_instance.last_hit = False
+            self.game_state = step_state
+
+    def target_frame_rate(self):
+        """Cadence de l'image suivante : pleine vitesse seulement si quelque chose bouge."""
+        if not self.assets_ready:
+            return FULL_FRAME_RATE
+        if time.time() - self.last_input_time < INPUT_GRACE or self.network_inbox:
+            return FULL_FRAME_RATE
+        if not self.in_game:
+            return MENU_FRAME_RATE
+        waiting = not self.is_solo and not self.online_game_started
+        game_over = bool(self.game_state and self.game_state.get('game_over', False))
+        if waiting or game_over or (self.paused and self.is_solo):
+            return IDLE_FRAME_RATE
+        return FULL_FRAME_RATE
+
+    def wait_next_frame(self):
+        """Attend l'image suivante ; sur un écran figé, dort jusqu'à la prochaine entrée."""
+        frame_rate = self.target_frame_rate()
+        if frame_rate != IDLE_FRAME_RATE:
+            self.clock.tick(frame_rate)
+            return
+
+        event = pygame.event.wait(1000 // IDLE_FRAME_RATE)
+        if event.type != pygame.NOEVENT:
+            # Remis dans la file pour handle_events, qui reprend aussitôt à pleine vitesse
+            pygame.event.post(event)
+        self.clock.tick()
+
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
                 return False
 
+            if event.type in INPUT_EVENTS:
+                self.last_input_time = time.time()
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                self.profiler.toggle_overlay()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F4:
+                self.profiler.toggle_trace()
+                continue
+
+            if not self.assets_ready:
+                continue
+
             if self.paused and self.is_solo and event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
                 if self.pause_state == "main":
@@ -1140,8 +1404,7 @@ class Game:
                         if (0 <= row < GRID_HEIGHT and col == GRID_WIDTH - 1):
                             if (0 <= row < GRID_HEIGHT and col == GRID_WIDTH - 1):
                                 if self.online_game_started and self.tcp_client.udp_client:
-                                    message = f"ADD_ZOMBIE:{self.selected_zombie}:{row}"
-                                    self.tcp_client.udp_client.send_message(message)
+                                    self.send_action(f"ADD_ZOMBIE:{self.selected_zombie}:{row}")
                 else:
                     button_clicked = False
 
@@ -1164,8 +1427,8 @@ class Game:
                                     self.game_instance.sun_points += sun_points
                                     self.game_state = self.game_instance.get_game_state()
                                 elif self.online_game_started and self.tcp_client.udp_client:
-                                    message = f"HARVEST_SUNFLOWER:{row}:{col}"
-                                    self.tcp_client.udp_client.send_message(message)
+                                    if self.send_action(f"HARVEST_SUNFLOWER:{row}:{col}"):
+                                        self.play_sound_effect(self.point)
                                 return True
                     for plant_type, card in self.plant_cards:
                         if card.is_clicked(mouse_pos):
@@ -1183,8 +1446,7 @@ class Game:
                                     if self.game_instance.remove_plant(row, col):
                                         self.game_state = self.game_instance.get_game_state()
                                 elif self.online_game_started and self.tcp_client.udp_client:
-                                    message = f"REMOVE_PLANT:{row}:{col}"
-                                    self.tcp_client.udp_client.send_message(message)
+                                    self.send_action(f"REMOVE_PLANT:{row}:{col}")
                             elif self.selected_zombie == 'dead':
                                 if self.is_solo:
                                     if self.game_instance.remove_zombie(row):
@@ -1195,17 +1457,10 @@ class Game:
                             else:
                                 if self.is_solo:
                                     plant_placed = self.game_instance.add_plant(self.selected_plant, row, col)
-                                    if plant_placed and self.selected_plant == 'icewall':
-                                        self.icewall_states[(row, col)] = {
-                                            'hit_time': 0,
-                                            'last_hit': 0,
-                                            'is_being_eaten': False
-                                        }
                                     if plant_placed:
                                         self.game_state = self.game_instance.get_game_state()
                                 elif self.online_game_started and self.tcp_client.udp_client:
-                                    message = f"ADD_PLANT:{self.selected_plant}:{row}:{col}"
-                                    self.tcp_client.udp_client.send_message(message)
+                                    self.send_action(f"ADD_PLANT:{self.selected_plant}:{row}:{col}")
 
             if self.paused and self.is_solo:
                 mouse_pos = pygame.mouse.get_pos()
@@ -1261,10 +1516,45 @@ class Game:
 
     def cleanup(self):
         if self.current_music:
-            self.current_music.stop()
+            pygame.mixer.music.stop()
         pygame.mixer.quit()
         pygame.quit()
 
+class Prediction:
+    """Prédiction locale des actions du joueur, réconciliée avec les snapshots du serveur."""
+
+    def __init__(self):
+        self.next_seq = 1
+        self.pending = OrderedDict()
+        self.snapshot = None
+
+    def predict(self, game_instance, action):
+        """Applique l'action tout de suite. Renvoie (succès local, message numéroté à envoyer)."""
+        seq = self.next_seq
+        self.next_seq += 1
+        self.pending[seq] = action
+        return game_instance.apply_action(action), f"{action}:{seq}"
+
+    def acknowledge(self, seq, accepted):
+        """Retire une action confirmée ; renvoie True si un refus impose de reconstruire l'état."""
+        action = self.pending.pop(seq, None)
+        return action is not None and not accepted and self.snapshot is not None
+
+    def reconcile(self, snapshot=None, client_id=None):
+        """Repart du dernier état serveur and rejoue les actions locales pas encore confirmées."""
+        from shared.game import Game as ServerGame
+        if snapshot is not None:
+            self.snapshot = snapshot
+            acked = snapshot.get('acks', {}).get(client_id, 0)
+            for seq in [seq for seq in self.pending if seq <= acked]:
+                del self.pending[seq]
+
+        game_instance = ServerGame(is_solo=False)
+        game_instance.restore(self.snapshot)
+        for action in list(self.pending.values()):
+            game_instance.apply_action(action)
+        return game_instance
+
 class TCPClient(TCPConnection):
     def __init__(self, host, port, game):
         super().__init__(host, port)
@@ -1308,11 +1598,7 @@ class TCPClient(TCPConnection):
 
                 if message.startswith("STATE:"):
                     state = int(message.split(":")[1])
-                    self.game.state = state
-                    if state == 1:
-                        from shared.game import Game as ServerGame
-                        self.game.game_instance = ServerGame(is_solo=False)
-                        self.game.game_state = self.game.game_instance.get_game_state()
+                    self.game.network_inbox.append(("STATE", state))
                     print(f"[TCP] State: {state}")
                 if message.startswith("ID:"):
                     self.client_id = message.split(":")[1]
@@ -1346,67 +1632,45 @@ class UDPClient(UDPConnection):
         self.receive_thread.start()
 
     def receive_messages(self):
+        """Décode les messages sur ce thread and les dépose dans la file de la boucle principale.
+
+        Ce thread ne touche jamais à l'état du jeu : Game.process_network_messages applique
+        la file une fois par image, sur le thread de rendu."""
+        inbox = self.game.network_inbox
         while self.running:
             try:
-                message, _ = self.socket.recvfrom(1024)
+                message, _ = self.socket.recvfrom(65535)
                 decoded_message = message.decode()
                 # print(f"[UDP] Received: {decoded_message}")
 
                 if decoded_message == "STATE:2":
-                    self.game.online_game_started = True
-                    self.game.last_update = time.time()
+                    inbox.append(("START", None))
                     print("[UDP] Game starting!")
                 elif decoded_message.startswith("ROLE:"):
-                    role = decoded_message.split(":")[1]
-                    self.game.is_attacker = (role == "att")
-                    # print(f"[UDP] Role assigned: {'Attacker' if self.game.is_attacker else 'Defender'}")
+                    inbox.append(("ROLE", decoded_message.split(":")[1]))
+                elif decoded_message.startswith("STATIC:"):
+                    # Renvoyé par le serveur avec chaque snapshot tant qu'il n'est pas acquitté
+                    self.send_message("STATIC_ACK")
+                    inbox.append(("STATIC", self.parse_payload(decoded_message)))
                 elif decoded_message.startswith("GAME_STATE:"):
-                    self.handle_game_state(decoded_message)
-                elif decoded_message.startswith("ADD_PLANT:"):
-                    # print(f"[UDP] Plant added: {decoded_message}")
-                    _, plant_type, row, col = decoded_message.split(":")
-                    self.game.game_instance.add_plant(plant_type, int(row), int(col))
-                    self.game.game_state = self.game.game_instance.get_game_state()
-                elif decoded_message.startswith("ADD_ZOMBIE:"):
-                    # print(f"[UDP] Zombie added: {decoded_message}")
-                    _, zombie_type, row = decoded_message.split(":")
-                    self.game.game_instance.add_zombie(zombie_type, int(row))
-                    self.game.game_state = self.game.game_instance.get_game_state()
-                elif decoded_message.startswith("REMOVE_PLANT:"):
-                    # print(f"[UDP] Plant removed: {decoded_message}")
-                    _, row, col = decoded_message.split(":")
-                    self.game.game_instance.remove_plant(int(row), int(col))
-                    self.game.game_state = self.game.game_instance.get_game_state()
-                elif decoded_message.startswith("REMOVE_PLANT:"):
-                    # print(f"[UDP] Plant removed: {decoded_message}")
-                    _, row, col = decoded_message.split(":")
-                    self.game.game_instance.remove_plant(int(row), int(col))
-                    self.game.game_state = self.game.game_instance.get_game_state()
-                elif decoded_message.startswith("HARVEST_SUNFLOWER:"):
-                    # print(f"[UDP] Sunflower harvested: {decoded_message}")
-                    _, row, col = decoded_message.split(":")
-                    sun_points = self.game.game_instance.plants[
-                        next(i for i, p in enumerate(self.game.game_instance.plants)
-                            if p.row == int(row) and p.col == int(col))
-                    ].harvest()
-                    if sun_points > 0:
-                        self.game.play_sound_effect(self.game.point)
-                    self.game.game_instance.sun_points += sun_points
-                    self.game.game_state = self.game.game_instance.get_game_state()
+                    inbox.append(("GAME_STATE", self.parse_payload(decoded_message)))
+                elif decoded_message.startswith("SNAPSHOT:"):
+                    # Horodaté à l'arrivée : le tampon d'interpolation absorbe ainsi la gigue du réseau
+                    inbox.append(("SNAPSHOT", (time.time(), self.parse_payload(decoded_message))))
+                elif decoded_message.startswith("ACK:"):
+                    _, seq, accepted = decoded_message.split(":")
+                    inbox.append(("ACK", (int(seq), accepted == "1")))
+                elif decoded_message.startswith(("ADD_PLANT:", "ADD_ZOMBIE:", "REMOVE_PLANT:", "HARVEST_SUNFLOWER:")):
+                    inbox.append(("ACTION", decoded_message))
                 elif decoded_message.startswith("SYSTEM:"):
                     print(f"[SYSTEM] {decoded_message.split(':', 1)[1]}")
             except Exception as e:
                 if self.running:
                     print(f"[UDP] Receive error: {e}")
 
-    def handle_game_state(self, message):
-        try:
-            game_state_str = message.split("GAME_STATE:", 1)[1]
-            import ast
-            game_state = ast.literal_eval(game_state_str)
-            self.game.game_state = game_state
-        except Exception as e:
-            print(f"[UDP] Error parsing game state: {e}")
+    def parse_payload(self, message):
+        import ast
+        return ast.literal_eval(message.split(":", 1)[1])
 
     def send_message(self, message):
         if not self.running:
@@ -1439,12 +1703,20 @@ def main():
     try:
         game = Game()
         game.play_music(game.menu_music)
+        profiler = game.profiler
         while game.running:
-            if not game.handle_events():
-                break
-            game.update()
-            game.render()
-            game.clock.tick(60)
+            profiler.begin_frame()
+            with profiler.phase('handle_events'):
+                if not game.handle_events():
+                    break
+            profiler.record_backlog(len(game.network_inbox))
+            with profiler.phase('update'):
+                game.update()
+            with profiler.phase('render'):
+                game.render()
+            with profiler.phase('tick'):
+                game.wait_next_frame()
+            profiler.end_frame()
 
     except Exception as e:
         print(f"[CLIENT] Error: {e}")
@@ -1454,6 +1726,7 @@ def main():
         if 'game' in locals() and hasattr(game, 'tcp_client') and game.tcp_client:
             game.tcp_client.shutdown()
         if 'game' in locals():
+            game.profiler.stop_trace()
             game.cleanup()
         print("[CLIENT] Disconnected")
 
@@ -0,0 +1,99 @@
+import math
+from array import array
+from bisect import bisect_right
+from collections import deque
+
+ABSENT = math.nan
+
+
+class SnapshotBuffer:
+    """Tampon de positions horodatées pour les entités distantes (les zombies).
+
+    Les positions sont celles du flux d'état : `x` en virgule fixe (POSITION_SCALE par case).
+
+    L'affichage se fait `delay` secondes derrière le temps réel, entre les deux snapshots
+    qui encadrent ce moment : un paquet en retard ne se voit plus à l'écran tant qu'il
+    arrive avant la fin du délai. Au-delà, la position est extrapolée au plus
+    `max_extrapolation` secondes puis figée.
+
+    Chaque identifiant reçoit un emplacement à sa première apparition ; un snapshot est un
+    tableau de positions indexé par emplacement (NaN si l'entité est absente). Un emplacement
+    est libéré, puis réutilisé, dès que son entité n'apparaît plus dans aucun snapshot gardé."""
+
+    def __init__(self, delay=0.1, max_extrapolation=0.1, capacity=32):
+        self.delay = delay
+        self.max_extrapolation = max_extrapolation
+        self.times = deque(maxlen=capacity)
+        self.positions = deque(maxlen=capacity)
+        self.slots = {}
+        self.last_seen = {}
+        self.free_slots = []
+
+    def clear(self):
+        self.times.clear()
+        self.positions.clear()
+        self.slots = {}
+        self.last_seen = {}
+        self.free_slots = []
+
+    def push(self, timestamp, entities):
+        """Enregistre les positions des entités (dicts avec 'id' and 'x') reçues à `timestamp`."""
+        if self.times and timestamp <= self.times[-1]:
+            return
+        for entity in entities:
+            if entity['id'] not in self.slots:
+                self.slots[entity['id']] = self.free_slots.pop() if self.free_slots else len(self.slots)
+            self.last_seen[entity['id']] = timestamp
+        positions = array('d', [ABSENT]) * (len(self.slots) + len(self.free_slots))
+        for entity in entities:
+            positions[self.slots[entity['id']]] = entity['x']
+        self.times.append(timestamp)
+        self.positions.append(positions)
+        self.release_slots()
+
+    def release_slots(self):
+        # Absente de tous les snapshots gardés : son emplacement y vaut NaN partout
+        oldest = self.times[0]
+        for entity_id in [entity_id for entity_id, seen in self.last_seen.items() if seen < oldest]:
+            del self.last_seen[entity_id]
+            self.free_slots.append(self.slots.pop(entity_id))
+
+    def sample(self, now):
+        """Positions de toutes les entités au temps de rendu `now - delay`, indexées par emplacement."""
+        if not self.times:
+            return array('d')
+        render_time = now - self.delay
+
+        index = bisect_right(self.times, render_time)
+        if index == 0:
+            return self.positions[0]
+        if index < len(self.times):
+            start, end = index - 1, index
+            t = render_time
+        else:
+            # Plus de snapshot après le temps de rendu : extrapolation bornée
+            if len(self.times) < 2 or self.max_extrapolation <= 0:
+                return self.positions[-1]
+            start, end = len(self.times) - 2, len(self.times) - 1
+            t = min(render_time, self.times[end] + self.max_extrapolation)
+
+        # Les snapshots plus anciens que l'intervalle courant ne serviront plus
+        for _ in range(start):
+            self.times.popleft()
+            self.positions.popleft()
+        start, end = 0, end - start
+
+        t0, t1 = self.times[start], self.times[end]
+        alpha = (t - t0) / (t1 - t0)
+        before, after = self.positions[start], self.positions[end]
+        result = array('d', after)
+        for slot in range(min(len(before), len(after))):
+            if not math.isnan(before[slot]) and not math.isnan(after[slot]):
+                result[slot] = before[slot] + (after[slot] - before[slot]) * alpha
+        return result
+
+    def position(self, sampled, entity_id, default):
+        slot = self.slots.get(entity_id)
+        if slot is None or slot >= len(sampled) or math.isnan(sampled[slot]):
+            return default
+        return sampled[slot]
@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import pygame
+
+PHASE_COLORS = {
+    'handle_events': (120, 200, 255),
+    'update': (120, 255, 140),
+    'render': (255, 200, 90),
+    'tick': (150, 150, 150),
+}
+GRAPH_WIDTH = 180
+GRAPH_HEIGHT = 50
+GRAPH_MAX = 1 / 20
+
+
+class FrameProfiler:
+    """Chronomètre les phases de chaque image de la boucle principale.
+
+    Affiche un panneau (F3) avec FPS, courbe des temps d'image, temps par phase and
+    nombre de messages réseau en attente ; enregistre à la demande (F4) une trace au
+    format Chrome (chrome://tracing, Perfetto)."""
+
+    def __init__(self, history=GRAPH_WIDTH, max_trace_events=500000):
+        self.visible = False
+        self.frame_times = deque(maxlen=history)
+        self.phase_times = {phase: deque(maxlen=history) for phase in PHASE_COLORS}
+        self.backlog = 0
+        self.frame_start = None
+        self.current = {}
+        self.trace_events = None
+        self.max_trace_events = max_trace_events
+        self.origin = time.perf_counter()
+        self.font = None
+        self.panel = None
+        self.next_refresh = 0
+
+    @property
+    def tracing(self):
+        return self.trace_events is not None
+
+    def toggle_overlay(self):
+        self.visible = not self.visible
+
+    def toggle_trace(self):
+        if self.tracing:
+            self.stop_trace()
+        else:
+            self.trace_events = []
+            print("[PROFILER] Trace recording started")
+
+    def stop_trace(self, path=None):
+        """Écrit la trace en cours dans un fichier JSON and renvoie son chemin."""
+        if not self.tracing:
+            return None
+        path = path or os.path.abspath(time.strftime("trace_%Y%m%d_%H%M%S.json"))
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, f)
+        print(f"[PROFILER] Trace with {len(self.trace_events)} events written to {path}")
+        self.trace_events = None
+        return path
+
+    def _timestamp(self, perf_time):
+        return (perf_time - self.origin) * 1e6
+
+    def begin_frame(self):
+        self.frame_start = time.perf_counter()
+        self.current = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.current[name] = self.current.get(name, 0.0) + duration
+            if self.tracing:
+                self.trace_events.append({
+                    'name': name, 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                    'ts': self._timestamp(start), 'dur': duration * 1e6,
+                })
+
+    def record_backlog(self, count):
+        self.backlog = count
+        if self.tracing:
+            self.trace_events.append({
+                'name': 'udp_backlog', 'ph': 'C', 'pid': os.getpid(),
+                'ts': self._timestamp(time.perf_counter()), 'args': {'messages': count},
+            })
+
+    def end_frame(self):
+        if self.frame_start is None:
+            return
+        end = time.perf_counter()
+        self.frame_times.append(end - self.frame_start)
+        for name, times in self.phase_times.items():
+            times.append(self.current.get(name, 0.0))
+        if self.tracing:
+            self.trace_events.append({
+                'name': 'frame', 'ph': 'X', 'pid': os.getpid(), 'tid': threading.get_ident(),
+                'ts': self._timestamp(self.frame_start), 'dur': (end - self.frame_start) * 1e6,
+            })
+            if len(self.trace_events) >= self.max_trace_events:
+                self.stop_trace()
+
+    def draw(self, screen):
+        """Dessine le panneau dans le coin supérieur gauche and renvoie son rectangle."""
+        now = time.perf_counter()
+        # Le texte n'est recalculé que quatre fois par seconde : le panneau reste bon marché
+        if self.panel is None or now >= self.next_refresh:
+            self.panel = self.render_panel()
+            self.next_refresh = now + 0.25
+        return screen.blit(self.panel, (5, 5))
+
+    def render_panel(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 18)
+
+        lines = []
+        if self.frame_times:
+            average = sum(self.frame_times) / len(self.frame_times)
+            lines.append((f"{1 / average if average else 0:5.1f} fps  {average * 1000:5.2f} ms"
+                          f"  max {max(self.frame_times) * 1000:5.2f} ms", (255, 255, 255)))
+        for name, times in self.phase_times.items():
+            if times:
+                lines.append((f"{name:<14}{sum(times) / len(times) * 1000:6.2f} ms", PHASE_COLORS[name]))
+        lines.append((f"udp backlog   {self.backlog}", (255, 255, 255)))
+        if self.tracing:
+            lines.append((f"REC {len(self.trace_events)} events", (255, 80, 80)))
+
+        line_height = 14
+        height = GRAPH_HEIGHT + 10 + line_height * len(lines)
+        panel = pygame.Surface((GRAPH_WIDTH + 10, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+
+        # Courbe des temps d'image, avec un repère à 60 FPS
+        base = GRAPH_HEIGHT + 5
+        target_y = base - int(GRAPH_HEIGHT * (1 / 60) / GRAPH_MAX)
+        pygame.draw.line(panel, (90, 90, 90), (5, target_y), (5 + GRAPH_WIDTH, target_y))
+        for x, frame_time in enumerate(self.frame_times):
+            bar = min(GRAPH_HEIGHT, int(GRAPH_HEIGHT * frame_time / GRAPH_MAX))
+            color = (120, 255, 140) if frame_time <= 1 / 55 else (255, 90, 90)
+            pygame.draw.line(panel, color, (5 + x, base), (5 + x, base - bar))
+
+        for i, (text, color) in enumerate(lines):
+            panel.blit(self.font.render(text, True, color), (5, GRAPH_HEIGHT + 8 + i * line_height))
+        return panel.convert_alpha()
@@ -0,0 +1,149 @@
+import json
+import os
+
+import pygame
+
+ATLAS_IMAGE = 'atlas.png'
+ATLAS_MANIFEST = 'atlas.json'
+ATLAS_WIDTH = 1024
+
+ZOMBIE_SHEETS = {
+    ('basic', 'walk'): ('basic.png', 4, 80, (130, 130)),
+    ('cone', 'walk'): ('cone.png', 3, 80, (130, 140)),
+    ('bucket', 'walk'): ('krampus.png', 3, 140, (130, 140)),
+    ('basic', 'attack'): ('basic_att.png', 3, 80, (130, 130)),
+    ('cone', 'attack'): ('cone_att.png', 3, 80, (130, 140)),
+    ('bucket', 'attack'): ('krampus_att.png', 3, 140, (130, 130)),
+}
+ZOMBIE_WALK_FRAMES = {zombie_type: sheet[1] for (zombie_type, mode), sheet in ZOMBIE_SHEETS.items() if mode == 'walk'}
+PEASHOOTER_FRAMES = 5
+
+CARD_COLUMNS = {
+    'plant': {'candycane': 0, 'peashooter': 1, 'icewall': 2, 'shovel': 3},
+    'zombie': {'basic': 0, 'cone': 1, 'bucket': 2, 'dead': 3},
+}
+HUD_PANELS = {'sun': 0, 'time': 47, 'energy': 94}
+
+
+def zombie_sprite_name(zombie_type, attacking, frame, health_state):
+    return f"zombie_{zombie_type}_{'attack' if attacking else 'walk'}_{frame}_{health_state}"
+
+
+def card_sprite_name(group, entity_type):
+    return f"card_{group}_{entity_type}"
+
+
+def _cut(sheet, area, size, cut_size=(80, 80)):
+    frame = pygame.Surface(cut_size, pygame.SRCALPHA)
+    frame.blit(sheet, (0, 0), area)
+    return pygame.transform.scale(frame, size)
+
+
+def slice_sprites(load):
+    """Découpe and met à l'échelle toutes les planches de sprites.
+
+    `load(filename)` renvoie la Surface d'un fichier de client/assets. Le résultat associe
+    un nom de sprite à sa Surface finale, telle qu'elle est affichée en jeu."""
+    sprites = {}
+
+    candycane = load('candycane.png')
+    sprites['candycane'] = _cut(candycane, (0, 0, 80, 80), (100, 100))
+    sprites['candycane_ready'] = _cut(candycane, (80, 0, 160, 80), (100, 100))
+
+    icewall = load('icewall.png')
+    for health_state in range(3):
+        sprites[f'icewall_{health_state}'] = _cut(icewall, (0, health_state * 120, 80, 120), (120, 120), (80, 120))
+        sprites[f'icewall_hit_{health_state}'] = _cut(icewall, (80, health_state * 120, 160, 120), (120, 120), (80, 120))
+
+    shooter = load('shooter.png')
+    for i in range(PEASHOOTER_FRAMES):
+        sprites[f'peashooter_{i}'] = _cut(shooter, (i * 80, 0, 80, 80), (120, 120))
+
+    for (zombie_type, mode), (filename, frame_count, height, size) in ZOMBIE_SHEETS.items():
+        sheet = load(filename)
+        for frame_index in range(frame_count):
+            for health_state in range(3):
+                name = zombie_sprite_name(zombie_type, mode == 'attack', frame_index, health_state)
+                sprites[name] = _cut(sheet, (frame_index * 80, health_state * 80, 80, height), size)
+
+    sprites['pea'] = pygame.transform.scale(load('snowball.png'), (30, 30))
+
+    cards = load('cartes.png')
+    for row, (group, columns) in enumerate(CARD_COLUMNS.items()):
+        for entity_type, column in columns.items():
+            area = (column * 100, row * 100, 100, 100)
+            sprites[card_sprite_name(group, entity_type)] = _cut(cards, area, (85, 100), (100, 100))
+
+    interface = pygame.transform.scale(load('card.png'), (160, 140))
+    for name, top in HUD_PANELS.items():
+        sprites[f'hud_{name}'] = _cut(interface, (0, top, 160, top + 47), (170, 47), (160, 47))
+
+    return sprites
+
+
+def pack_atlas(sprites):
+    """Range les sprites par étagères dans une seule Surface. Renvoie (atlas, rectangles)."""
+    rects = {}
+    x = y = shelf_height = 0
+    for name, surface in sorted(sprites.items(), key=lambda item: (-item[1].get_height(), item[0])):
+        width, height = surface.get_size()
+        if x + width > ATLAS_WIDTH:
+            x, y = 0, y + shelf_height
+            shelf_height = 0
+        rects[name] = (x, y, width, height)
+        x += width
+        shelf_height = max(shelf_height, height)
+
+    atlas = pygame.Surface((ATLAS_WIDTH, y + shelf_height), pygame.SRCALPHA)
+    for name, rect in rects.items():
+        atlas.blit(sprites[name], rect[:2])
+    return atlas, rects
+
+
+def bake(assets_dir):
+    sprites = slice_sprites(lambda filename: pygame.image.load(os.path.join(assets_dir, filename)))
+    atlas, rects = pack_atlas(sprites)
+    pygame.image.save(atlas, os.path.join(assets_dir, ATLAS_IMAGE))
+    with open(os.path.join(assets_dir, ATLAS_MANIFEST), 'w') as f:
+        json.dump({'size': atlas.get_size(), 'sprites': rects}, f, indent=1, sort_keys=True)
+    return atlas, rects
+
+
+def read_sprites(assets_dir):
+    """Lit l'atlas pré-calculé sans toucher à l'écran : utilisable hors du thread principal.
+
+    Sans atlas (ou s'il est incomplet), les planches sont découpées and rangées en mémoire
+    dans un atlas équivalent. Renvoie (atlas, rectangles)."""
+    manifest_path = os.path.join(assets_dir, ATLAS_MANIFEST)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        if all(name in manifest['sprites'] for name in expected_sprite_names()):
+            return pygame.image.load(os.path.join(assets_dir, ATLAS_IMAGE)), manifest['sprites']
+        print("[CLIENT] Atlas incomplet, relancer tools/bake_assets.py")
+    else:
+        print("[CLIENT] Atlas introuvable, découpage des sprites au démarrage (voir tools/bake_assets.py)")
+
+    sprites = slice_sprites(lambda filename: pygame.image.load(os.path.join(assets_dir, filename)))
+    return pack_atlas(sprites)
+
+
+def convert_sprites(atlas, rects):
+    """Convertit l'atlas au format de l'écran (thread principal) and le découpe en sous-surfaces."""
+    atlas = atlas.convert_alpha()
+    return {name: atlas.subsurface(pygame.Rect(rect)) for name, rect in rects.items()}
+
+
+def load_sprites(assets_dir):
+    return convert_sprites(*read_sprites(assets_dir))
+
+
+def expected_sprite_names():
+    names = ['candycane', 'candycane_ready', 'pea']
+    names += [f'icewall_{h}' for h in range(3)] + [f'icewall_hit_{h}' for h in range(3)]
+    names += [f'peashooter_{i}' for i in range(PEASHOOTER_FRAMES)]
+    for (zombie_type, mode), (_, frame_count, _, _) in ZOMBIE_SHEETS.items():
+        names += [zombie_sprite_name(zombie_type, mode == 'attack', f, h) for f in range(frame_count) for h in range(3)]
+    names += [card_sprite_name(group, t) for group, columns in CARD_COLUMNS.items() for t in columns]
+    names += [f'hud_{name}' for name in HUD_PANELS]
+    return names
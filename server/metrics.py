@@ -0,0 +1,209 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _Shards:
+    """Per-thread values: each thread only ever writes its own slot, so updates
+    need no lock. Readers sum over a snapshot of the slots."""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.slots = {}
+
+    def local(self):
+        tid = threading.get_ident()
+        slot = self.slots.get(tid)
+        if slot is None:
+            slot = self.slots[tid] = self.factory()
+        return slot
+
+    def values(self):
+        return list(self.slots.values())
+
+
+class Counter:
+    def __init__(self):
+        self.shards = _Shards(lambda: [0])
+
+    def inc(self, amount=1):
+        self.shards.local()[0] += amount
+
+    def value(self):
+        return sum(slot[0] for slot in self.shards.values())
+
+
+class Gauge:
+    def __init__(self, function=None):
+        self.function = function
+        self.current = 0
+
+    def set(self, value):
+        self.current = value
+
+    def value(self):
+        return self.function() if self.function else self.current
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # Slot layout: one count per bucket, then +Inf, then the sum
+        self.shards = _Shards(lambda: [0] * (len(buckets) + 2))
+
+    def observe(self, value):
+        slot = self.shards.local()
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                slot[i] += 1
+                break
+        else:
+            slot[len(self.buckets)] += 1
+        slot[-1] += value
+
+    def value(self):
+        totals = [0] * (len(self.buckets) + 2)
+        for slot in self.shards.values():
+            for i, v in enumerate(slot):
+                totals[i] += v
+        return totals
+
+
+class MetricFamily:
+    def __init__(self, kind, name, documentation, labelnames, factory):
+        self.kind = kind
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.factory = factory
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        child = self.children.get(key)
+        if child is None:
+            with self.lock:
+                child = self.children.get(key)
+                if child is None:
+                    child = self.children[key] = self.factory()
+        return child
+
+    def remove(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self.lock:
+            self.children.pop(key, None)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for key, child in list(self.children.items()):
+            label_pairs = list(zip(self.labelnames, key))
+            if self.kind == 'histogram':
+                totals = child.value()
+                cumulative = 0
+                for bound, count in zip(child.buckets + [float('inf')], totals):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else repr(bound)
+                    lines.append(f"{self.name}_bucket{_format_labels(label_pairs + [('le', le)])} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(label_pairs)} {totals[-1]}")
+                lines.append(f"{self.name}_count{_format_labels(label_pairs)} {cumulative}")
+            else:
+                lines.append(f"{self.name}{_format_labels(label_pairs)} {child.value()}")
+        return "\n".join(lines)
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Registry:
+    def __init__(self):
+        self.families = {}
+
+    def _register(self, family):
+        self.families.setdefault(family.name, family)
+        return self.families[family.name]
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(MetricFamily('counter', name, documentation, labelnames, Counter))
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        return self._register(MetricFamily('gauge', name, documentation, labelnames, lambda: Gauge(function)))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1)):
+        return self._register(MetricFamily('histogram', name, documentation, labelnames,
+                                           lambda: Histogram(list(buckets))))
+
+    def render(self):
+        return "\n".join(family.render() for family in list(self.families.values())) + "\n"
+
+
+REGISTRY = Registry()
+
+TICK_DURATION = REGISTRY.histogram(
+    'santajam_tick_duration_seconds', 'Time spent in one room simulation tick.', ('room',))
+INPUT_LATENCY = REGISTRY.histogram(
+    'santajam_input_latency_seconds', 'Time from a UDP action being received to the tick that applies it.', ('room',))
+TICK_OVERRUNS = REGISTRY.counter(
+    'santajam_tick_overruns_total', 'Ticks that took longer than the tick interval.', ('room',))
+UDP_PACKETS = REGISTRY.counter(
+    'santajam_udp_packets_total', 'UDP packets by direction and message type.', ('direction', 'type'))
+UDP_BYTES = REGISTRY.counter(
+    'santajam_udp_bytes_total', 'UDP payload bytes by direction and message type.', ('direction', 'type'))
+DECODE_ERRORS = REGISTRY.counter(
+    'santajam_udp_decode_errors_total', 'UDP packets that could not be decoded.').labels()
+SEND_ERRORS = REGISTRY.counter(
+    'santajam_udp_send_errors_total', 'UDP packets that could not be sent, by message type.', ('type',))
+TICK_ERRORS = REGISTRY.counter(
+    'santajam_tick_errors_total', 'Room ticks that raised an exception.', ('room',))
+
+KNOWN_MESSAGE_TYPES = {
+    'CONNECT', 'ROLE', 'STATE', 'STATIC', 'STATIC_ACK', 'GAME_STATE', 'SNAPSHOT', 'ACK', 'SYSTEM',
+    'ADD_PLANT', 'ADD_ZOMBIE', 'REMOVE_PLANT', 'HARVEST_SUNFLOWER',
+}
+
+
+def message_type(message):
+    """Label value for a message, restricted to known types to bound cardinality."""
+    prefix = message.split(":", 1)[0]
+    return prefix if prefix in KNOWN_MESSAGE_TYPES else 'other'
+
+
+def count_send_error(message):
+    SEND_ERRORS.labels(type=message_type(message)).inc()
+
+
+def count_udp(direction, message, size):
+    msg_type = message_type(message)
+    UDP_PACKETS.labels(direction=direction, type=msg_type).inc()
+    UDP_BYTES.labels(direction=direction, type=msg_type).inc(size)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_http_server(port, host='127.0.0.1'):
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    print(f"Metrics server started on http://{host}:{port}/metrics")
+    return server
@@ -1,15 +1,21 @@
 import random
-from shared.protocol import UDPConnection
-from shared.game import Game
+from collections import deque
+from shared.protocol import UDPConnection, split_action
+from shared.game import Game, ROLE_FIELDS
+from metrics import TICK_DURATION, TICK_OVERRUNS, TICK_ERRORS, INPUT_LATENCY, DECODE_ERRORS, count_udp, count_send_error
+import socket
 import threading
 import time
 
+STATIC_MESSAGE = f"STATIC:{Game.static_data()}"
+
 class UDPServer(UDPConnection):
     def __init__(self, host, port):
         super().__init__(host, port)
         self.socket.bind((self.host, self.port))
         self.client_addresses = {}
         self.running = True
+        self.receive_thread = None
         self.message_handlers = {}
         self.roles = {}
         self.assigned_roles = set()
@@ -19,19 +25,40 @@ class UDPServer(UDPConnection):
 
     def start(self):
         print(f"UDP Server started on {self.host}:{self.port}")
-        threading.Thread(target=self.receive_messages).start()
+        self.receive_thread = threading.Thread(target=self.receive_messages)
+        self.receive_thread.start()
 
     def stop(self):
         self.running = False
+        # Closing the socket does not wake a thread blocked in recvfrom on Linux:
+        # send it a datagram, wait for it to exit, and only then free the port
+        if self.receive_thread and self.receive_thread is not threading.current_thread():
+            host = '127.0.0.1' if self.host in ('0.0.0.0', '') else self.host
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as waker:
+                waker.sendto(b"", (host, self.port))
+            self.receive_thread.join(timeout=1.0)
+        self.socket.close()
+
+    def reset(self):
+        self.client_addresses = {}
+        self.roles = {}
+        self.assigned_roles = set()
 
     def receive_messages(self):
         while self.running:
             try:
                 message, client_address = self.socket.recvfrom(1024)
+                if not self.running:
+                    break
                 if not message:
                     continue
 
-                decoded_message = message.decode()
+                try:
+                    decoded_message = message.decode()
+                except UnicodeDecodeError:
+                    DECODE_ERRORS.inc()
+                    continue
+                count_udp('in', decoded_message, len(message))
                 # print(f"[UDP] Received from {client_address}: {decoded_message}")
 
                 if decoded_message.startswith("CONNECT:"):
@@ -45,7 +72,7 @@ class UDPServer(UDPConnection):
 
                     self.assigned_roles.add(role)
                     self.roles[client_id] = role
-                    self.socket.sendto(f"ROLE:{role}".encode(), client_address)
+                    self.send_to_address(f"ROLE:{role}", client_address)
                 else:
                     client_id = next((cid for cid, addr in self.client_addresses.items()
                                     if addr == client_address), None)
@@ -59,10 +86,21 @@ class UDPServer(UDPConnection):
                     print(f"[UDP] Error: {e}")
                 continue
 
+    def send_to_address(self, message, address):
+        data = message.encode()
+        try:
+            self.socket.sendto(data, address)
+        except OSError as e:
+            # e.g. a SNAPSHOT above the 65507-byte datagram limit: drop it, keep the room alive
+            count_send_error(message)
+            print(f"[UDP] Send error ({len(data)} bytes to {address}): {e}")
+            return
+        count_udp('out', message, len(data))
+
     def broadcast_to_client(self, message, client_id):
         if client_id in self.client_addresses:
             # print(f"[UDP] Sending to {client_id}: {message}")
-            self.socket.sendto(message.encode(), self.client_addresses[client_id])
+            self.send_to_address(message, self.client_addresses[client_id])
 
     def broadcast_to_all_clients(self, message):
         for client_id in self.client_addresses:
@@ -70,7 +108,6 @@ class UDPServer(UDPConnection):
 
 class Room:
     def __init__(self, room_id, udp_host, udp_port):
-        self.room_id = room_id
         self.udp_host = '127.0.0.1'
         self.udp_port = udp_port
         self.clients = []
@@ -80,15 +117,47 @@ class Room:
             self.udp_server.register_handler("ADD_ZOMBIE:", self.handle_game_action)
             self.udp_server.register_handler("REMOVE_PLANT:", self.handle_game_action)
             self.udp_server.register_handler("HARVEST_SUNFLOWER:", self.handle_game_action)
+            self.udp_server.register_handler("STATIC_ACK", self.handle_static_ack)
             self.udp_server.start()
         except OSError as e:
             print(f"[ROOM] Could not start UDP server on port {udp_port}: {e}")
             raise e
-        self.is_private = not room_id.startswith("public")
+        self.assign(room_id)
         self.game_thread = None
         self.game_running = False
         self.tick_rate = 20
+        self.snapshot_interval = 2
+        self.game = Game(is_solo=False)
+        self.last_seq = {}
+        self.pending_actions = deque()
+        self.static_acked = set()
+        self.applied_actions = 0
+        self.total_input_latency = 0.0
+        self.max_input_latency = 0.0
+
+    def assign(self, room_id):
+        self.room_id = room_id
+        self.is_private = not room_id.startswith("public")
+
+    def reset(self):
+        """Bring a finished room back to a fresh state so it can be reused."""
+        self.game_running = False
+        if self.game_thread and self.game_thread is not threading.current_thread():
+            self.game_thread.join(timeout=2.0)
+        TICK_DURATION.remove(room=self.room_id)
+        TICK_OVERRUNS.remove(room=self.room_id)
+        TICK_ERRORS.remove(room=self.room_id)
+        INPUT_LATENCY.remove(room=self.room_id)
+        self.game_thread = None
+        self.clients = []
+        self.udp_server.reset()
         self.game = Game(is_solo=False)
+        self.last_seq = {}
+        self.pending_actions.clear()
+        self.static_acked = set()
+        self.applied_actions = 0
+        self.total_input_latency = 0.0
+        self.max_input_latency = 0.0
 
     def add_client(self, client_id):
         if len(self.clients) < 2:
@@ -107,78 +176,135 @@ class Room:
 
     def game_loop(self):
         time.sleep(1)
+        if not self.game_running:
+            return
+        # Fixed data goes out here and again with each snapshot until the client acknowledges it
+        self.broadcast_udp(STATIC_MESSAGE)
         self.broadcast_udp("STATE:2")
 
         last_time = time.time()
+        tick = 0
 
         while self.game_running and len(self.clients) == 2:
             current_time = time.time()
             delta_time = current_time - last_time
 
             if delta_time >= 1.0/self.tick_rate:
-                self.game.update(delta_time)
-                game_state = self.game.get_game_state()
-
-                if game_state.get('game_over', False):
-                    self.broadcast_udp(f"GAME_STATE:{game_state}")
-                    break
-
                 last_time = current_time
+                try:
+                    tick_start = time.perf_counter()
+                    self.apply_pending_actions()
+                    self.game.update(delta_time)
+                    tick_duration = time.perf_counter() - tick_start
+                    TICK_DURATION.labels(room=self.room_id).observe(tick_duration)
+                    if tick_duration > 1.0/self.tick_rate:
+                        TICK_OVERRUNS.labels(room=self.room_id).inc()
+
+                    if self.game.game_over:
+                        self.broadcast_game_state(self.game.get_game_state())
+                        break
+
+                    tick += 1
+                    if tick % self.snapshot_interval == 0:
+                        self.broadcast_snapshot()
+                except Exception as e:
+                    # A failing tick must not kill the loop and leave the room stuck in game_running
+                    TICK_ERRORS.labels(room=self.room_id).inc()
+                    print(f"[ROOM] Tick error in room {self.room_id}: {e}")
             else:
                 time.sleep(0.001)
 
-        print(f"[ROOM] Game loop ended in room {self.room_id}")
+        print(f"[ROOM] Game loop ended in room {self.room_id}, input stats: {self.get_input_stats()}")
         self.game_running = False
 
     def handle_game_action(self, action, client_id):
+        # Called from the UDP receive thread: the game is only touched by the tick loop
+        self.pending_actions.append((action, client_id, time.time()))
+
+    def handle_static_ack(self, message, client_id):
+        self.static_acked.add(client_id)
+
+    def apply_pending_actions(self):
+        for _ in range(len(self.pending_actions)):
+            message, client_id, received_at = self.pending_actions.popleft()
+            action, seq = split_action(message)
+            success = self.apply_game_action(action, client_id)
+            if seq is None:
+                if success:
+                    self.broadcast_udp(action)
+            else:
+                # The sender already predicted the action: it only needs the verdict
+                self.last_seq[client_id] = max(seq, self.last_seq.get(client_id, 0))
+                self.udp_server.broadcast_to_client(f"ACK:{seq}:{int(bool(success))}", client_id)
+                if success:
+                    self.broadcast_udp(action, sender_id=client_id)
+            latency = time.time() - received_at
+            INPUT_LATENCY.labels(room=self.room_id).observe(latency)
+            self.applied_actions += 1
+            self.total_input_latency += latency
+            self.max_input_latency = max(self.max_input_latency, latency)
+
+    def apply_game_action(self, action, client_id):
         if action.startswith("ADD_PLANT:"):
             _, plant_type, row, col = action.split(":")
-            success = self.game.add_plant(plant_type, int(row), int(col))
-            if success:
-                self.broadcast_udp(action)
+            return self.game.add_plant(plant_type, int(row), int(col))
         elif action.startswith("ADD_ZOMBIE:"):
             if self.udp_server.roles.get(client_id) != "att":
                 print(f"[ROOM] Client {client_id} is not authorized to add zombies")
-                return
+                return False
 
             _, zombie_type, row = action.split(":")
             success = self.game.add_zombie(zombie_type, int(row))
             print(f"[ROOM] Player {client_id} added zombie at {row} with success: {success}")
-            if success:
-                self.broadcast_udp(action)
+            return success
         elif action.startswith("REMOVE_PLANT:"):
             if self.udp_server.roles.get(client_id) != "def":
                 print(f"[ROOM] Client {client_id} is not authorized to remove plants")
-                return
+                return False
 
             _, row, col = action.split(":")
             success = self.game.remove_plant(int(row), int(col))
             print(f"[ROOM] Player {client_id} removed plant at {row},{col} with success: {success}")
-            if success:
-                self.broadcast_udp(action)
+            return success
         elif action.startswith("HARVEST_SUNFLOWER:"):
             if self.udp_server.roles.get(client_id) != "def":
                 print(f"[ROOM] Client {client_id} is not authorized to harvest candycanes")
-                return
+                return False
 
             _, row, col = action.split(":")
-            row, col = int(row), int(col)
-
-            for plant in self.game.plants:
-                if plant.row == row and plant.col == col and plant.type == 'candycane':
-                    sun_points = plant.harvest()
-                    if sun_points > 0:
-                        self.game.sun_points += sun_points
-                        self.broadcast_udp(action)
-                    break
+            return self.game.harvest_candycane(int(row), int(col))
+        return False
 
     def get_game_state(self):
         return {
             'players': self.clients,
         }
 
+    def get_input_stats(self):
+        return {
+            'queued': len(self.pending_actions),
+            'applied': self.applied_actions,
+            'avg_latency': self.total_input_latency / self.applied_actions if self.applied_actions else 0.0,
+            'max_latency': self.max_input_latency,
+        }
+
+    def broadcast_snapshot(self):
+        # One view per client: its role's economy and its own ack only
+        snapshot = self.game.snapshot()
+        common = Game.view_for(snapshot, None)
+        for client_id in self.clients:
+            if client_id not in self.static_acked:
+                self.udp_server.broadcast_to_client(STATIC_MESSAGE, client_id)
+            role = self.udp_server.roles.get(client_id)
+            private = {key: snapshot[key] for key, owner in ROLE_FIELDS.items() if owner == role}
+            private['acks'] = {client_id: self.last_seq.get(client_id, 0)}
+            view = {**common, **private}
+            self.udp_server.broadcast_to_client(f"SNAPSHOT:{view}", client_id)
+
     def broadcast_game_state(self, game_state):
-        self.broadcast_udp(f"GAME_STATE:{game_state}")
+        for client_id in self.clients:
+            view = Game.view_for(game_state, self.udp_server.roles.get(client_id))
+            self.udp_server.broadcast_to_client(f"GAME_STATE:{view}", client_id)
 
     def shutdown(self):
         self.game_running = False
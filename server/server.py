@@ -5,28 +5,165 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from shared.protocol import TCPConnection
 from room import Room
+import metrics
+from collections import deque
+import itertools
 import threading
-import random
 import time
 
+class Matchmaker:
+    def __init__(self):
+        self.queue = deque()
+        self.waiting = {}
+        self.next_ticket = 0
+        self.next_room_number = 1
+        self.lock = threading.Lock()
+        self.matches = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+
+    def find_match(self, client_id):
+        """Pair with the oldest waiting player, or open a new public room and wait."""
+        with self.lock:
+            while self.queue:
+                waiting_id, ticket = self.queue.popleft()
+                entry = self.waiting.get(waiting_id)
+                if entry is None or entry[0] != ticket:
+                    continue
+                del self.waiting[waiting_id]
+                _, room_id, enqueued_at = entry
+                wait_time = time.time() - enqueued_at
+                self.matches += 1
+                self.total_wait_time += wait_time
+                self.max_wait_time = max(self.max_wait_time, wait_time)
+                print(f"[MATCH] Paired {client_id} with {waiting_id} in {room_id} after {wait_time:.1f}s")
+                return room_id
+
+            room_id = f"public_{self.next_room_number}"
+            self.next_room_number += 1
+            self._enqueue(client_id, room_id)
+            return room_id
+
+    def requeue(self, client_id, room_id):
+        """Put a player whose partner left before the match started back in the queue, in their room."""
+        with self.lock:
+            self._enqueue(client_id, room_id)
+        print(f"[MATCH] Partner of {client_id} left, waiting again in {room_id}")
+
+    def _enqueue(self, client_id, room_id):
+        self.next_ticket += 1
+        self.queue.append((client_id, self.next_ticket))
+        self.waiting[client_id] = (self.next_ticket, room_id, time.time())
+
+    def is_waiting(self, client_id):
+        with self.lock:
+            return client_id in self.waiting
+
+    def cancel(self, client_id):
+        # Queue entries are skipped lazily in find_match, keeping removal O(1)
+        with self.lock:
+            self.waiting.pop(client_id, None)
+
+    def get_stats(self):
+        with self.lock:
+            now = time.time()
+            waits = [now - enqueued_at for _, _, enqueued_at in self.waiting.values()]
+            return {
+                'queue_depth': len(self.waiting),
+                'matches': self.matches,
+                'avg_wait': self.total_wait_time / self.matches if self.matches else 0.0,
+                'max_wait': self.max_wait_time,
+                'longest_current_wait': max(waits, default=0.0),
+            }
+
+class RoomPool:
+    def __init__(self, size, first_port, last_port):
+        self.size = size
+        self.idle = deque()
+        self.free_ports = deque(range(first_port, last_port))
+        self.lock = threading.Lock()
+        self.warm_lock = threading.Lock()
+
+    def warm_up(self):
+        """Fill the pool up to its target size with rooms ready to be handed out."""
+        if not self.warm_lock.acquire(blocking=False):
+            return
+        try:
+            while True:
+                with self.lock:
+                    if len(self.idle) >= self.size:
+                        break
+                room = self.create_room()
+                if room is None:
+                    break
+                with self.lock:
+                    self.idle.append(room)
+        finally:
+            self.warm_lock.release()
+
+    def create_room(self):
+        while True:
+            with self.lock:
+                if not self.free_ports:
+                    return None
+                port = self.free_ports.popleft()
+            try:
+                return Room("idle", '0.0.0.0', port)
+            except OSError:
+                print(f"[TCP] Port UDP {port} déjà utilisé, essai du suivant...")
+
+    def acquire(self, room_id):
+        with self.lock:
+            room = self.idle.popleft() if self.idle else None
+        if room is None:
+            room = self.create_room()
+            if room is None:
+                raise Exception("Plus de ports UDP disponibles")
+        else:
+            threading.Thread(target=self.warm_up, daemon=True).start()
+        room.assign(room_id)
+        return room
+
+    def release(self, room):
+        room.reset()
+        with self.lock:
+            if len(self.idle) < self.size:
+                room.assign("idle")
+                self.idle.append(room)
+                return
+        room.shutdown()
+        with self.lock:
+            self.free_ports.append(room.udp_port)
+
 class TCPServer(TCPConnection):
-    def __init__(self, host, port):
+    def __init__(self, host, port, room_pool_size=4, udp_ports=(12347, 12447)):
         super().__init__(host, port)
         self.socket.bind((self.host, self.port))
         self.socket.listen()
         self.clients = {}
+        # Ids only come from accept_clients' thread: a plain counter never collides
+        self.client_ids = itertools.count(1000)
         self.rooms = {}
-        self.next_udp_port = 12347
-        self.max_udp_port = 12447
+        # Reentrant: joining and leaving hold it around room lookup and membership changes
+        self.rooms_lock = threading.RLock()
+        self.matchmaker = Matchmaker()
+        self.room_pool = RoomPool(room_pool_size, *udp_ports)
+        metrics.REGISTRY.gauge('santajam_active_rooms', 'Rooms currently hosting players.',
+                               function=lambda: len(self.rooms)).labels()
+        metrics.REGISTRY.gauge('santajam_active_clients', 'Connected TCP clients.',
+                               function=lambda: len(self.clients)).labels()
+        metrics.REGISTRY.gauge('santajam_matchmaking_queue_depth', 'Players waiting for a public match.',
+                               function=lambda: len(self.matchmaker.waiting)).labels()
 
     def start(self):
+        self.room_pool.warm_up()
         print(f"TCP Server started on {self.host}:{self.port}")
         threading.Thread(target=self.accept_clients).start()
 
     def accept_clients(self):
         while True:
             client_socket, client_address = self.socket.accept()
-            client_id = str(random.randint(1000, 9999))
+            client_id = str(next(self.client_ids))
             self.clients[client_id] = client_socket
             self.send_id(client_socket, client_id)
             time.sleep(0.1)
@@ -46,6 +183,8 @@ class TCPServer(TCPConnection):
                 if message.startswith("JOIN:"):
                     room_type = message.split(":")[1]
                     current_room = self.handle_join_request(client_socket, client_id, room_type)
+                elif message.startswith("STATS"):
+                    client_socket.send(f"STATS:{self.matchmaker.get_stats()}".encode())
                 elif message.startswith("QUIT"):
                     break
             except Exception as e:
@@ -56,8 +195,16 @@ class TCPServer(TCPConnection):
 
     def handle_join_request(self, client_socket, client_id, room_type):
         try:
-            room = self.get_or_create_room(room_type)
-            if room.add_client(client_id):
+            public = room_type == "public"
+            if public:
+                room_type = self.matchmaker.find_match(client_id)
+            with self.rooms_lock:
+                room = self.get_or_create_room(room_type)
+                joined = room.add_client(client_id)
+                # Paired, but the partner left before we got in: wait for someone else here
+                if joined and public and len(room.clients) == 1 and not self.matchmaker.is_waiting(client_id):
+                    self.matchmaker.requeue(client_id, room_type)
+            if joined:
                 udp_info = f"UDP:{room.udp_host}:{room.udp_port}"
                 client_socket.send(udp_info.encode())
                 print(f"[TCP] Sent UDP info to client {client_id}: {udp_info}")
@@ -67,14 +214,22 @@ class TCPServer(TCPConnection):
                 return None
         except Exception as e:
             print(f"[TCP] Error creating/joining room: {e}")
+            self.matchmaker.cancel(client_id)
             client_socket.send(f"ERROR:{str(e)}".encode())
             return None
 
     def cleanup_client(self, client_id, current_room):
         try:
+            self.matchmaker.cancel(client_id)
             if current_room:
-                if current_room.remove_client(client_id):
-                    self.close_room(current_room.room_id)
+                # Only detach the room under the lock: releasing it joins the game thread,
+                # which must not hold up joins to other rooms
+                with self.rooms_lock:
+                    empty = current_room.remove_client(client_id)
+                    if empty and self.rooms.get(current_room.room_id) is current_room:
+                        del self.rooms[current_room.room_id]
+                if empty:
+                    self.room_pool.release(current_room)
                 else:
                     current_room.broadcast_udp(f"SYSTEM:Client {client_id} disconnected")
 
@@ -87,25 +242,20 @@ class TCPServer(TCPConnection):
             print(f"[TCP] Error during cleanup: {e}")
 
     def close_room(self, room_id):
-        if room_id in self.rooms:
-            self.rooms[room_id].shutdown()
-            del self.rooms[room_id]
+        with self.rooms_lock:
+            room = self.rooms.pop(room_id, None)
+        if room:
+            self.room_pool.release(room)
 
     def get_or_create_room(self, room_id):
-        if room_id not in self.rooms:
-            while self.next_udp_port < self.max_udp_port:
-                try:
-                    self.rooms[room_id] = Room(room_id, '0.0.0.0', self.next_udp_port)
-                    self.next_udp_port += 1
-                    return self.rooms[room_id]
-                except OSError as e:
-                    print(f"[TCP] Port UDP {self.next_udp_port} déjà utilisé, essai du suivant...")
-                    self.next_udp_port += 1
-            raise Exception("Plus de ports UDP disponibles")
-        return self.rooms[room_id]
+        with self.rooms_lock:
+            if room_id not in self.rooms:
+                self.rooms[room_id] = self.room_pool.acquire(room_id)
+            return self.rooms[room_id]
 
 def main():
     tcp_server = TCPServer('0.0.0.0', 12345)
+    metrics.start_http_server(9100)
     tcp_server.start()
 
 
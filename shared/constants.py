@@ -1,5 +1,7 @@
 GRID_WIDTH = 9
 GRID_HEIGHT = 5
+# Positions des zombies and projectiles en virgule fixe : unités entières par case
+POSITION_SCALE = 256
 
 PLANT_TYPES = {
     'candycane': {'cost': 50, 'health': 100},
@@ -1,5 +1,14 @@
-from shared.constants import GRID_WIDTH, ZOMBIE_TYPES, PLANT_TYPES
-from typing import Any
+from shared.constants import GRID_WIDTH, ZOMBIE_TYPES, PLANT_TYPES, POSITION_SCALE
+from typing import Any, Tuple
+
+def fixed_step(carry: float, distance: float) -> Tuple[int, float]:
+    """Découpe un déplacement (en unités de position) en unités entières.
+
+    La fraction restante est reportée au pas suivant : la vitesse moyenne reste exacte
+    même quand un pas fait moins d'une unité."""
+    carry += distance
+    units = int(carry)
+    return units, carry - units
 
 class Plant:
     def __init__(self, plant_type: str, row: int, col: int):
@@ -12,6 +21,8 @@ class Plant:
         self.shoot_timer = 0
         self.ready_to_harvest = False
         self.shooting = False
+        self.id = 0
+
     def has_zombie_in_front(self, zombies: list) -> bool:
         for zombie in zombies:
             if zombie.row == self.row and zombie.col > self.col:
@@ -31,13 +42,14 @@ class Plant:
             if self.shoot_timer >= 1.0 and has_zombie:
                 self.shoot_timer = 0
                 self.shooting = True
-                return Projectile(self.row, self.col)
+                return Projectile(self.row, self.col * POSITION_SCALE)
             elif self.shoot_timer >= 0.3:
                 self.shooting = False
         return None
 
     def to_dict(self) -> dict:
         base_dict = {
+            'id': self.id,
             'type': self.type,
             'row': self.row,
             'col': self.col,
@@ -48,6 +60,33 @@ class Plant:
             base_dict['shooting'] = self.shooting
         return base_dict
 
+    def to_snapshot(self) -> dict:
+        # Seuls les minuteurs du type de plante sont transmis : les autres restent à zéro.
+        # La case n'y figure pas, elle se déduit du bitmap d'occupation du snapshot
+        snapshot = {
+            'id': self.id,
+            'type': self.type,
+            'health': self.health
+        }
+        if self.type == 'candycane':
+            snapshot['sun_timer'] = self.sun_timer
+            snapshot['ready_to_harvest'] = self.ready_to_harvest
+        elif self.type == 'peashooter':
+            snapshot['shoot_timer'] = self.shoot_timer
+            snapshot['shooting'] = self.shooting
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, data: dict, row: int, col: int) -> 'Plant':
+        plant = cls(data['type'], row, col)
+        plant.id = data['id']
+        plant.health = data['health']
+        plant.sun_timer = data.get('sun_timer', 0)
+        plant.shoot_timer = data.get('shoot_timer', 0)
+        plant.ready_to_harvest = data.get('ready_to_harvest', False)
+        plant.shooting = data.get('shooting', False)
+        return plant
+
     def take_damage(self, damage: int) -> None:
         self.health -= damage
 
@@ -66,14 +105,19 @@ class Zombie:
     def __init__(self, zombie_type: str, row: int, initial_offset: float = 0):
         self.type = zombie_type
         self.row = row
-        self.col = float(GRID_WIDTH) + initial_offset
+        self.x = round((GRID_WIDTH + initial_offset) * POSITION_SCALE)
+        self.carry = 0.0
         self.health = ZOMBIE_TYPES[zombie_type]['health']
         self.speed = ZOMBIE_TYPES[zombie_type]['speed']
         self.attack_damage = ZOMBIE_TYPES[zombie_type]['damage']
         self.attack_speed = ZOMBIE_TYPES[zombie_type]['attack_speed']
         self.attack_timer = 0
         self.eating = False
-        self.id = id(self)
+        self.id = 0
+
+    @property
+    def col(self) -> float:
+        return self.x / POSITION_SCALE
 
     def update(self, delta_time: float, plant_in_front: Plant = None) -> None:
         if plant_in_front:
@@ -86,30 +130,70 @@ class Zombie:
                 self.attack_timer = 0
         else:
             self.eating = False
-            self.col -= (self.speed / 5) * delta_time
+            units, self.carry = fixed_step(self.carry, -(self.speed / 5) * POSITION_SCALE * delta_time)
+            self.x += units
 
     def to_dict(self) -> dict:
         return {
             'type': self.type,
             'row': self.row,
-            'col': self.col,
+            'x': self.x,
             'health': self.health,
             'id': self.id,
             'is_eating': self.eating
         }
 
+    def to_snapshot(self) -> dict:
+        snapshot = self.to_dict()
+        snapshot['attack_timer'] = self.attack_timer
+        # Sans le reste de fixed_step, chaque restauration décalerait le client d'une unité au
+        # plus ; arrondi au millième, l'écart reste sous 0,001 unité
+        snapshot['carry'] = round(self.carry, 3)
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> 'Zombie':
+        zombie = cls(data['type'], data['row'])
+        zombie.x = data['x']
+        zombie.health = data['health']
+        zombie.id = data['id']
+        zombie.eating = data['is_eating']
+        zombie.attack_timer = data['attack_timer']
+        zombie.carry = data.get('carry', 0.0)
+        return zombie
+
 class Projectile:
-    def __init__(self, row: int, col: int):
+    def __init__(self, row: int, x: int):
         self.row = row
-        self.col = col
+        self.x = x
+        self.carry = 0.0
         self.speed = 5.0
         self.damage = 20
+        self.id = 0
+
+    @property
+    def col(self) -> float:
+        return self.x / POSITION_SCALE
 
     def update(self, delta_time: float) -> None:
-        self.col += self.speed * delta_time
+        units, self.carry = fixed_step(self.carry, self.speed * POSITION_SCALE * delta_time)
+        self.x += units
 
     def to_dict(self) -> dict:
         return {
+            'id': self.id,
             'row': self.row,
-            'col': self.col
+            'x': self.x
         }
+
+    def to_snapshot(self) -> dict:
+        snapshot = self.to_dict()
+        snapshot['carry'] = round(self.carry, 3)
+        return snapshot
+
+    @classmethod
+    def from_snapshot(cls, data: dict) -> 'Projectile':
+        projectile = cls(data['row'], data['x'])
+        projectile.id = data['id']
+        projectile.carry = data.get('carry', 0.0)
+        return projectile
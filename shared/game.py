@@ -1,8 +1,15 @@
 from typing import List, Dict, Any
 from .entities import Plant, Zombie, Projectile  # Ajout de Projectile
-from .constants import GRID_WIDTH, GRID_HEIGHT, PLANT_TYPES, ZOMBIE_TYPES
+from .constants import GRID_WIDTH, GRID_HEIGHT, PLANT_TYPES, ZOMBIE_TYPES, POSITION_SCALE
 import random
 
+# Champs d'état qu'un seul rôle affiche : chaque client ne reçoit que son économie
+ROLE_FIELDS = {
+    'sun_points': 'def',
+    'energy': 'att',
+    'energy_timer': 'att'
+}
+
 class Game:
     def __init__(self, is_solo: bool = False):
         self.plants: List[Plant] = []
@@ -20,6 +27,8 @@ class Game:
         self.winner = None
         self.pending_zombies = []
         self.game_duration = 0
+        # Identifiants attribués dans l'ordre de création : identiques sur le serveur and les clients
+        self.next_entity_id = 1
         if is_solo:
             self.zombie_wave_interval = 30
             self.last_wave_time = 0
@@ -35,7 +44,7 @@ class Game:
         if self.is_solo and current_time is not None:
             self.handle_zombie_spawn(current_time)
 
-        if not self.is_solo:
+        if not self.is_solo and self.energy is not None:
             self.energy_timer += delta_time
             if self.energy_timer >= 5.0:
                 self.energy += 25
@@ -51,9 +60,9 @@ class Game:
         for plant in self.plants:
             result = plant.update(delta_time, self.zombies)
             if isinstance(result, int):
-                self.sun_points += result
+                self.earn('sun_points', result)
             elif result is not None:
-                self.projectiles.append(result)
+                self.projectiles.append(self.assign_id(result))
 
         for proj in self.projectiles[:]:
             if proj not in self.projectiles:
@@ -62,8 +71,8 @@ class Game:
             for zombie in self.zombies[:]:
                 if zombie not in self.zombies:
                     continue
-                if (proj.row == zombie.row and 
-                    abs(proj.col - zombie.col) < 0.5):
+                if (proj.row == zombie.row and
+                    abs(proj.x - zombie.x) < POSITION_SCALE // 2):
                     zombie.health -= proj.damage
                     if proj in self.projectiles:
                         self.projectiles.remove(proj)
@@ -71,21 +80,21 @@ class Game:
                     if zombie.health <= 0 and zombie in self.zombies:
                         self.zombies.remove(zombie)
                     break
-            if proj in self.projectiles and proj.col >= GRID_WIDTH:
+            if proj in self.projectiles and proj.x >= GRID_WIDTH * POSITION_SCALE:
                 self.projectiles.remove(proj)
 
         for zombie in self.zombies[:]:
             plant_in_front = None
             for plant in self.plants:
                 if (plant.row == zombie.row and
-                    plant.col <= zombie.col and
+                    plant.col * POSITION_SCALE <= zombie.x and
                     plant.col >= int(zombie.col) - 0.1 and
                     (plant_in_front is None or plant.col > plant_in_front.col)):
                     plant_in_front = plant
 
             zombie.update(delta_time, plant_in_front)
 
-            if zombie.col < -1:
+            if zombie.x < -POSITION_SCALE:
                 self.zombies.remove(zombie)
                 self.game_over = True
                 if not self.is_solo:
@@ -96,9 +105,10 @@ class Game:
             if plant.is_dead():
                 self.grid[plant.row][plant.col] = None
                 self.plants.remove(plant)
-                self.energy += 50
+                self.earn('energy', 50)
 
-        self.sun_points = min(self.sun_points, 999)
+        if self.sun_points is not None:
+            self.sun_points = min(self.sun_points, 999)
         
     def handle_zombie_spawn(self, current_time: int) -> None:
         self.adjust_difficulty()
@@ -151,17 +161,112 @@ class Game:
     def get_game_state(self) -> Dict[str, Any]:
         return {
             'plants': sorted([plant.to_dict() for plant in self.plants], key=lambda p: p['row']),
-            'zombies': sorted([zombie.to_dict() for zombie in self.zombies], key=lambda z: (z['row'], z['col'])),
+            'zombies': sorted([zombie.to_dict() for zombie in self.zombies], key=lambda z: (z['row'], z['x'])),
             'projectiles': [proj.to_dict() for proj in self.projectiles],
             'sun_points': self.sun_points,
             'energy': self.energy,
-            'grid': self.grid,
-            'available_plants': [p for p in PLANT_TYPES.keys() if p != 'shovel'],
+            'occupancy': self.occupancy(),
             'game_over': self.game_over,
             'winner': self.winner,
             'last_hit': self.last_hit if hasattr(self, 'last_hit') else False
         }
 
+    @staticmethod
+    def static_data() -> Dict[str, Any]:
+        """Données fixes pour toute la partie : envoyées une seule fois, au lancement."""
+        return {
+            'available_plants': [p for p in PLANT_TYPES.keys() if p != 'shovel'],
+            'grid_width': GRID_WIDTH,
+            'grid_height': GRID_HEIGHT,
+            'position_scale': POSITION_SCALE
+        }
+
+    def occupancy(self) -> int:
+        """Cases occupées de la grille, en bits : le bit row * GRID_WIDTH + col vaut 1 si une plante s'y trouve."""
+        bits = 0
+        for plant in self.plants:
+            bits |= 1 << (plant.row * GRID_WIDTH + plant.col)
+        return bits
+
+    def snapshot(self) -> Dict[str, Any]:
+        """État complet de la simulation, sérialisable, pour resynchroniser un client."""
+        # Plantes rangées dans l'ordre des bits de `occupancy`, qui porte leurs cases
+        plants = sorted(self.plants, key=lambda plant: plant.row * GRID_WIDTH + plant.col)
+        return {
+            'occupancy': self.occupancy(),
+            'plants': [plant.to_snapshot() for plant in plants],
+            'zombies': [zombie.to_snapshot() for zombie in self.zombies],
+            'projectiles': [proj.to_snapshot() for proj in self.projectiles],
+            'sun_points': self.sun_points,
+            'energy': self.energy,
+            'energy_timer': self.energy_timer,
+            'game_duration': self.game_duration,
+            'game_over': self.game_over,
+            'winner': self.winner,
+            'next_entity_id': self.next_entity_id
+        }
+
+    @staticmethod
+    def view_for(state: Dict[str, Any], role: str) -> Dict[str, Any]:
+        """Copie de `state` (snapshot or get_game_state) sans les champs réservés à l'autre rôle."""
+        return {key: value for key, value in state.items() if ROLE_FIELDS.get(key, role) == role}
+
+    def restore(self, snapshot: Dict[str, Any]) -> None:
+        cells = [cell for cell in range(GRID_WIDTH * GRID_HEIGHT) if snapshot['occupancy'] >> cell & 1]
+        plants = [Plant.from_snapshot(data, *divmod(cell, GRID_WIDTH))
+                  for cell, data in zip(cells, snapshot['plants'])]
+        # Les identifiants suivent l'ordre de pose : le tri retrouve l'ordre de mise à jour du serveur
+        self.plants = sorted(plants, key=lambda plant: plant.id)
+        self.grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+        for plant in self.plants:
+            self.grid[plant.row][plant.col] = plant
+        self.zombies = [Zombie.from_snapshot(data) for data in snapshot['zombies']]
+        self.projectiles = [Projectile.from_snapshot(data) for data in snapshot['projectiles']]
+        # Économie absente de la vue d'un rôle : None, elle n'est pas suivie par ce client
+        self.sun_points = snapshot.get('sun_points')
+        self.energy = snapshot.get('energy')
+        self.energy_timer = snapshot.get('energy_timer', 0)
+        self.game_duration = snapshot['game_duration']
+        self.game_over = snapshot['game_over']
+        self.winner = snapshot['winner']
+        self.next_entity_id = snapshot['next_entity_id']
+
+    def apply_action(self, action: str) -> bool:
+        """Applique une action du protocole (ADD_PLANT:..., ADD_ZOMBIE:..., etc.) sans numéro de séquence."""
+        parts = action.split(":")
+        if parts[0] == "ADD_PLANT":
+            return self.add_plant(parts[1], int(parts[2]), int(parts[3]))
+        elif parts[0] == "ADD_ZOMBIE":
+            return self.add_zombie(parts[1], int(parts[2]))
+        elif parts[0] == "REMOVE_PLANT":
+            return self.remove_plant(int(parts[1]), int(parts[2]))
+        elif parts[0] == "HARVEST_SUNFLOWER":
+            return self.harvest_candycane(int(parts[1]), int(parts[2]))
+        return False
+
+    def spend(self, pool: str, cost: int) -> bool:
+        """Débite `cost` de l'économie `pool` ('sun_points' or 'energy') si elle suffit.
+
+        Une économie à None est celle de l'adversaire, que ce client ne reçoit pas :
+        le serveur a déjà validé la dépense, elle est acceptée telle quelle."""
+        balance = getattr(self, pool)
+        if balance is None:
+            return True
+        if cost > balance:
+            return False
+        setattr(self, pool, balance - cost)
+        return True
+
+    def earn(self, pool: str, amount: int) -> None:
+        balance = getattr(self, pool)
+        if balance is not None:
+            setattr(self, pool, balance + amount)
+
+    def assign_id(self, entity):
+        entity.id = self.next_entity_id
+        self.next_entity_id += 1
+        return entity
+
     def add_plant(self, plant_type: str, row: int, col: int) -> bool:
         if row < 0 or row >= GRID_HEIGHT or col < 0 or col >= GRID_WIDTH:
             print(f"[GAME] Invalid plant position: {row}, {col}")
@@ -171,13 +276,12 @@ class Game:
             return False
 
         new_plant = Plant(plant_type, row, col)
-        if new_plant.cost > self.sun_points:
+        if not self.spend('sun_points', new_plant.cost):
             print(f"[GAME] Not enough sun points to add plant: {new_plant.cost} and sun_points: {self.sun_points}")
             return False
 
-        self.plants.append(new_plant)
+        self.plants.append(self.assign_id(new_plant))
         self.grid[row][col] = new_plant
-        self.sun_points -= new_plant.cost
         return True
 
     def add_zombie(self, zombie_type: str, row: int, initial_offset: float = 0) -> bool:
@@ -185,20 +289,18 @@ class Game:
             print(f"[GAME] Invalid zombie type: {zombie_type}")
             return False
 
+        if not (0 <= row < GRID_HEIGHT):
+            print(f"[GAME] Invalid row: {row}")
+            return False
+
         if not self.is_solo:
             cost = ZOMBIE_TYPES[zombie_type].get('cost', 50)
-            if cost > self.energy:
+            if not self.spend('energy', cost):
                 print(f"[GAME] Not enough energy: {cost} required, have {self.energy}")
                 return False
 
-        if not (0 <= row < GRID_HEIGHT):
-            print(f"[GAME] Invalid row: {row}")
-            return False
-
-        new_zombie = Zombie(zombie_type, row, initial_offset)
+        new_zombie = self.assign_id(Zombie(zombie_type, row, initial_offset))
         self.zombies.append(new_zombie)
-        if not self.is_solo:
-            self.energy -= cost
         return True
 
     def remove_plant(self, row: int, col: int) -> bool:
@@ -211,7 +313,7 @@ class Game:
             return False
 
         refund = int(plant.cost * 0.5)
-        self.sun_points += refund
+        self.earn('sun_points', refund)
         self.grid[row][col] = None
         self.plants.remove(plant)
         # print(f"[GAME] Removed plant at {row}, {col}. Refunded {refund} sun points")
@@ -223,6 +325,6 @@ class Game:
             if plant.row == row and plant.col == col and plant.type == 'candycane':
                 points = plant.harvest()
                 if points > 0:
-                    self.sun_points += points
+                    self.earn('sun_points', points)
                     return True
         return False
@@ -1,6 +1,21 @@
 import socket
 import threading
 
+ACTION_FIELDS = {
+    'ADD_PLANT': 3,
+    'ADD_ZOMBIE': 2,
+    'REMOVE_PLANT': 2,
+    'HARVEST_SUNFLOWER': 2,
+}
+
+def split_action(message):
+    """Sépare une action de son numéro de séquence optionnel : (action, seq ou None)."""
+    parts = message.split(":")
+    fields = ACTION_FIELDS.get(parts[0])
+    if fields is not None and len(parts) == fields + 2:
+        return ":".join(parts[:-1]), int(parts[-1])
+    return message, None
+
 class TCPConnection:
     def __init__(self, host, port):
         self.host = host
@@ -0,0 +1,25 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(ROOT, 'client'))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from sprites import bake
+
+
+def main():
+    """Pré-découpe les planches de client/assets dans atlas.png + atlas.json.
+
+    À relancer après toute modification d'une planche de sprites."""
+    pygame.init()
+    assets_dir = os.path.join(ROOT, 'client', 'assets')
+    atlas, rects = bake(assets_dir)
+    width, height = atlas.get_size()
+    print(f"Atlas {width}x{height} with {len(rects)} sprites written to {assets_dir}")
+
+
+if __name__ == "__main__":
+    main()
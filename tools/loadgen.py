@@ -0,0 +1,281 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'server'))
+
+import argparse
+import asyncio
+import random
+import re
+import subprocess
+import time
+from collections import deque
+from shared.constants import GRID_WIDTH, GRID_HEIGHT
+
+ID_RE = re.compile(r"ID:(\d+)")
+UDP_RE = re.compile(r"UDP:([\d.]+):(\d+)")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def process_cpu_time(pid):
+    """Temps CPU (user + system) d'un processus, lu dans /proc. None si indisponible."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class BotProtocol(asyncio.DatagramProtocol):
+    def __init__(self, bot):
+        self.bot = bot
+
+    def datagram_received(self, data, addr):
+        self.bot.on_udp_message(data.decode(errors='replace'))
+
+
+class Bot:
+    """Client sans pygame qui rejoue le protocole TCP/UDP du vrai client."""
+
+    def __init__(self, host, port, stats, action_interval):
+        self.host = host
+        self.port = port
+        self.stats = stats
+        self.action_interval = action_interval
+        self.client_id = None
+        self.role = None
+        self.started = asyncio.Event()
+        self.transport = None
+        self.writer = None
+        self.pending = {}
+        self.last_state_time = None
+        self.placed = []
+
+    async def run(self):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        buffer = ""
+        while self.client_id is None:
+            buffer += (await reader.read(1024)).decode()
+            match = ID_RE.search(buffer)
+            if match:
+                self.client_id = match.group(1)
+
+        self.writer.write(b"JOIN:public")
+        await self.writer.drain()
+        while True:
+            data = await reader.read(1024)
+            if not data:
+                raise ConnectionError("server closed the TCP connection")
+            buffer += data.decode()
+            if "ERROR:" in buffer:
+                raise ConnectionError(buffer.split("ERROR:", 1)[1])
+            match = UDP_RE.search(buffer)
+            if match:
+                udp_addr = (match.group(1), int(match.group(2)))
+                break
+
+        loop = asyncio.get_running_loop()
+        self.transport, _ = await loop.create_datagram_endpoint(
+            lambda: BotProtocol(self), remote_addr=udp_addr)
+        self.transport.sendto(f"CONNECT:{self.client_id}".encode())
+        self.stats['connected'] += 1
+
+        await self.started.wait()
+        while True:
+            await asyncio.sleep(self.action_interval * random.uniform(0.5, 1.5))
+            self.send_action(self.next_action())
+
+    def next_action(self):
+        if self.role == 'att':
+            return f"ADD_ZOMBIE:basic:{random.randint(0, GRID_HEIGHT - 1)}"
+        if self.placed and random.random() < 0.5:
+            row, col = random.choice(self.placed)
+            return f"HARVEST_SUNFLOWER:{row}:{col}"
+        row, col = random.randint(0, GRID_HEIGHT - 1), random.randint(0, GRID_WIDTH - 1)
+        return f"ADD_PLANT:candycane:{row}:{col}"
+
+    def send_action(self, message):
+        now = time.perf_counter()
+        sent = self.pending.setdefault(message, deque())
+        # Les actions refusées par le serveur ne sont jamais renvoyées
+        while sent and now - sent[0] > 5.0:
+            sent.popleft()
+            self.stats['unacked'] += 1
+        sent.append(now)
+        self.transport.sendto(message.encode())
+        self.stats['sent'] += 1
+
+    def on_udp_message(self, message):
+        now = time.perf_counter()
+        self.stats['received'] += 1
+        if message.startswith("ROLE:"):
+            self.role = message.split(":")[1]
+        elif message == "STATE:2":
+            self.started.set()
+        elif message.startswith("STATIC:"):
+            self.transport.sendto(b"STATIC_ACK")
+        elif message.startswith("SNAPSHOT:"):
+            if self.last_state_time is not None:
+                self.stats['state_intervals'].append(now - self.last_state_time)
+            self.last_state_time = now
+        else:
+            sent = self.pending.get(message)
+            if sent:
+                # Un écho correspond au dernier envoi : les précédents ont été refusés
+                self.stats['rtts'].append(now - sent.pop())
+                self.stats['unacked'] += len(sent)
+                sent.clear()
+                if message.startswith("ADD_PLANT:"):
+                    _, _, row, col = message.split(":")
+                    self.placed.append((int(row), int(col)))
+
+    def close(self):
+        if self.transport:
+            self.transport.close()
+        if self.writer:
+            self.writer.close()
+
+
+def new_stats():
+    return {'connected': 0, 'sent': 0, 'received': 0, 'unacked': 0,
+            'errors': 0, 'rtts': [], 'state_intervals': []}
+
+
+async def run_bot(bot, stats):
+    try:
+        await bot.run()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        stats['errors'] += 1
+        print(f"[LOAD] Bot {bot.client_id} failed: {e}")
+
+
+async def run_load(args, server_pid):
+    bots, tasks = [], []
+    rows = []
+    for rooms in args.rooms:
+        stats = new_stats()
+        while len(bots) < rooms * 2:
+            bot = Bot(args.host, args.port, stats, args.action_interval)
+            bots.append(bot)
+            tasks.append(asyncio.create_task(run_bot(bot, stats)))
+            await asyncio.sleep(1.0 / args.connect_rate)
+        for bot in bots:
+            bot.stats = stats
+
+        await asyncio.sleep(args.warmup)
+        for key in ('sent', 'received', 'unacked'):
+            stats[key] = 0
+        stats['rtts'].clear()
+        stats['state_intervals'].clear()
+
+        cpu_start, wall_start = process_cpu_time(server_pid), time.perf_counter()
+        await asyncio.sleep(args.duration)
+        cpu_end, wall_end = process_cpu_time(server_pid), time.perf_counter()
+
+        cpu = None
+        if cpu_start is not None and cpu_end is not None:
+            cpu = 100 * (cpu_end - cpu_start) / (wall_end - wall_start)
+        intervals = stats['state_intervals']
+        mean_interval = sum(intervals) / len(intervals) if intervals else 0
+        rows.append({
+            'rooms': rooms,
+            'clients': sum(1 for bot in bots if bot.started.is_set()),
+            'sent': stats['sent'],
+            'acked': len(stats['rtts']),
+            'errors': stats['errors'],
+            'rtt_p50': percentile(stats['rtts'], 50),
+            'rtt_p99': percentile(stats['rtts'], 99),
+            'jitter_p99': percentile([abs(i - mean_interval) for i in intervals], 99),
+            'cpu': cpu,
+        })
+        print_row(rows[-1])
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for bot in bots:
+        bot.close()
+    return rows
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value * 1000:.1f}"
+
+
+def print_row(row):
+    cpu = "n/a" if row['cpu'] is None else f"{row['cpu']:.0f}%"
+    print(f"{row['rooms']:>6} {row['clients']:>8} {row['sent']:>7} {row['acked']:>7} {row['errors']:>6} "
+          f"{format_ms(row['rtt_p50']):>9} {format_ms(row['rtt_p99']):>9} "
+          f"{format_ms(row['jitter_p99']):>11} {cpu:>7}")
+
+
+def start_server(args):
+    command = [sys.executable, os.path.abspath(__file__), '--serve',
+               '--port', str(args.port), '--udp-ports', f"{args.udp_ports[0]}-{args.udp_ports[1]}"]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(args.server_startup)
+    return server
+
+
+def serve(args):
+    from server import TCPServer
+    TCPServer(args.host, args.port, udp_ports=tuple(args.udp_ports)).start()
+
+
+def parse_port_range(value):
+    first, last = value.split("-")
+    return int(first), int(last)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Générateur de charge : bots sans pygame contre un TCPServer local.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=12345)
+    parser.add_argument('--rooms', type=lambda v: [int(r) for r in v.split(",")], default=[10, 50, 100],
+                        help="paliers de salles, ex: 10,50,100")
+    parser.add_argument('--udp-ports', type=parse_port_range, default=(20000, 22000))
+    parser.add_argument('--duration', type=float, default=10.0, help="durée de mesure par palier (s)")
+    parser.add_argument('--warmup', type=float, default=3.0, help="attente avant mesure par palier (s)")
+    parser.add_argument('--action-interval', type=float, default=1.0)
+    parser.add_argument('--connect-rate', type=float, default=10.0, help="connexions par seconde")
+    parser.add_argument('--server-startup', type=float, default=2.0)
+    parser.add_argument('--external-server', type=int, metavar='PID', default=None,
+                        help="utiliser un serveur déjà lancé (PID pour la mesure CPU)")
+    parser.add_argument('--serve', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+
+    server = None
+    if args.external_server is None:
+        server = start_server(args)
+        server_pid = server.pid
+    else:
+        server_pid = args.external_server
+
+    print(f"{'rooms':>6} {'clients':>8} {'sent':>7} {'acked':>7} {'errors':>6} "
+          f"{'p50 ms':>9} {'p99 ms':>9} {'jitter p99':>11} {'cpu':>7}")
+    try:
+        asyncio.run(run_load(args, server_pid))
+    finally:
+        if server:
+            server.kill()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
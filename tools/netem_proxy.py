@@ -0,0 +1,387 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import subprocess
+import time
+from shared.protocol import ACTION_FIELDS, split_action
+
+UDP_RE = re.compile(r"UDP:([\d.]+):(\d+)")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class Impairment:
+    """Dégradations d'un sens de circulation : retard, gigue, perte, duplication and réordonnancement.
+
+    Les tirages viennent d'un générateur dédié à ce sens : à graine égale, le n-ième message
+    subit toujours le même sort."""
+
+    def __init__(self, rng, latency=0.0, jitter=0.0, loss=0.0, duplicate=0.0, reorder=0.0, reorder_delay=0.0):
+        self.rng = rng
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.duplicate = duplicate
+        self.reorder = reorder
+        self.reorder_delay = reorder_delay
+
+    def delay(self):
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        if self.reorder and self.rng.random() < self.reorder:
+            # Retenu plus longtemps : les messages suivants le doublent
+            delay += self.reorder_delay
+        return delay
+
+    def schedule(self):
+        """Retards des copies à livrer : vide si le message est perdu, deux valeurs s'il est dupliqué."""
+        if self.loss and self.rng.random() < self.loss:
+            return []
+        delays = [self.delay()]
+        if self.duplicate and self.rng.random() < self.duplicate:
+            delays.append(self.delay())
+        return delays
+
+
+class MessageLog:
+    """Journal des messages relayés and mesures tirées du protocole.
+
+    - action -> ACK : de l'envoi d'une action numérotée à la livraison de son ACK à l'émetteur ;
+    - action -> écho : de l'envoi d'une action à sa livraison à l'autre joueur (ou à l'émetteur
+      pour une action sans numéro, que le serveur renvoie à tout le monde) ;
+    - désynchronisations : actions refusées (ACK:seq:0, la prédiction locale est annulée ;
+      sans numéro, un envoi jamais renvoyé avant un envoi identique) and actions restées
+      sans réponse ;
+    - snapshots perdus and écart entre deux snapshots livrés à un même client."""
+
+    def __init__(self, path=None):
+        self.origin = time.perf_counter()
+        self.file = open(path, 'w') if path else None
+        self.actions = 0
+        self.sequenced = {}
+        self.in_flight = {}
+        self.ack_latencies = []
+        self.echo_latencies = []
+        self.refused = 0
+        self.snapshots_sent = 0
+        self.snapshots_lost = 0
+        self.last_snapshot = {}
+        self.snapshot_gaps = []
+        self.counts = {'in': 0, 'dropped': 0, 'duplicated': 0}
+
+    def now(self):
+        return time.perf_counter() - self.origin
+
+    def write(self, event):
+        if self.file:
+            self.file.write(json.dumps(event) + "\n")
+
+    def received(self, link, direction, message, copies):
+        """Message reçu par le proxy, avant dégradation ; `copies` est le nombre de livraisons prévues."""
+        now = self.now()
+        self.counts['in'] += 1
+        if not copies:
+            self.counts['dropped'] += 1
+        elif copies > 1:
+            self.counts['duplicated'] += 1
+        self.write({'t': round(now, 6), 'link': link, 'dir': direction, 'event': 'recv',
+                    'type': message.split(":", 1)[0], 'bytes': len(message), 'copies': copies})
+
+        if direction == 'up' and message.split(":", 1)[0] in ACTION_FIELDS:
+            self.actions += 1
+            action, seq = split_action(message)
+            if seq is not None:
+                self.sequenced[(link, seq)] = (now, action)
+            self.in_flight.setdefault(action, []).append((now, link, seq))
+        elif direction == 'down' and message.startswith("SNAPSHOT:"):
+            self.snapshots_sent += 1
+            self.snapshots_lost += not copies
+
+    def delivered(self, link, direction, message, delay):
+        now = self.now()
+        msg_type = message.split(":", 1)[0]
+        self.write({'t': round(now, 6), 'link': link, 'dir': direction, 'event': 'send',
+                    'type': msg_type, 'bytes': len(message), 'delay': round(delay, 6)})
+        if direction != 'down':
+            return
+
+        if msg_type == "ACK":
+            _, seq, accepted = message.split(":")
+            sent = self.sequenced.pop((link, int(seq)), None)
+            if sent is not None:
+                sent_at, action = sent
+                self.ack_latencies.append(now - sent_at)
+                if accepted != "1":
+                    # Refusée : le serveur ne la renverra pas à l'autre joueur
+                    self.refused += 1
+                    self.in_flight[action] = [entry for entry in self.in_flight[action]
+                                              if entry[1:] != (link, int(seq))]
+        elif msg_type == "SNAPSHOT":
+            if link in self.last_snapshot:
+                self.snapshot_gaps.append(now - self.last_snapshot[link])
+            self.last_snapshot[link] = now
+        elif msg_type in ACTION_FIELDS:
+            self.echoed(link, message, now)
+
+    def echoed(self, link, message, now):
+        """Comme dans loadgen, un écho répond au dernier envoi de l'action : les envois
+        précédents du même joueur ont été refusés."""
+        pending = self.in_flight.get(message, [])
+        for i in range(len(pending) - 1, -1, -1):
+            sent_at, sender, seq = pending[i]
+            # Une action numérotée n'est renvoyée qu'à l'autre joueur
+            if sender != link or seq is None:
+                self.echo_latencies.append(now - sent_at)
+                superseded = [entry for entry in pending[:i] if entry[1] == sender]
+                # Sans numéro, un refus ne se voit qu'ainsi ; avec, l'ACK l'a déjà compté
+                self.refused += sum(1 for entry in superseded if entry[2] is None)
+                self.in_flight[message] = [entry for entry in pending[:i] if entry[1] != sender] + pending[i + 1:]
+                return
+
+    def summary(self):
+        unanswered = len(self.sequenced) + sum(1 for pending in self.in_flight.values()
+                                               for entry in pending if entry[2] is None)
+        return {
+            'messages': self.counts['in'],
+            'dropped': self.counts['dropped'],
+            'duplicated': self.counts['duplicated'],
+            'actions': self.actions,
+            'ack_p50': percentile(self.ack_latencies, 50),
+            'ack_p99': percentile(self.ack_latencies, 99),
+            'echo_p50': percentile(self.echo_latencies, 50),
+            'echo_p99': percentile(self.echo_latencies, 99),
+            'refused': self.refused,
+            'unanswered': unanswered,
+            'desync_rate': (self.refused + unanswered) / self.actions if self.actions else None,
+            'snapshot_loss': self.snapshots_lost / self.snapshots_sent if self.snapshots_sent else None,
+            'snapshot_gap_p99': percentile(self.snapshot_gaps, 99),
+        }
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class UDPSide(asyncio.DatagramProtocol):
+    def __init__(self, link, direction):
+        self.link = link
+        self.direction = direction
+
+    def datagram_received(self, data, addr):
+        self.link.relay(self.direction, data, addr)
+
+
+class UDPLink:
+    """Relais UDP d'un client : un port local face au client, un socket vers le port de la salle."""
+
+    def __init__(self, proxy, link_id, server_addr):
+        self.proxy = proxy
+        self.link_id = link_id
+        self.server_addr = server_addr
+        self.client_addr = None
+        self.client_side = None
+        self.server_side = None
+        self.impairments = {direction: proxy.impairment(link_id, direction) for direction in ('up', 'down')}
+
+    async def open(self, host):
+        loop = asyncio.get_running_loop()
+        self.client_side, _ = await loop.create_datagram_endpoint(
+            lambda: UDPSide(self, 'up'), local_addr=(host, 0))
+        self.server_side, _ = await loop.create_datagram_endpoint(
+            lambda: UDPSide(self, 'down'), remote_addr=self.server_addr)
+        return self.client_side.get_extra_info('sockname')[1]
+
+    def relay(self, direction, data, addr):
+        if direction == 'up':
+            self.client_addr = addr
+        elif self.client_addr is None:
+            return
+        message = data.decode(errors='replace')
+        delays = self.impairments[direction].schedule()
+        self.proxy.log.received(self.link_id, direction, message, len(delays))
+        loop = asyncio.get_running_loop()
+        for delay in delays:
+            loop.call_later(delay, self.deliver, direction, data, message, delay)
+
+    def deliver(self, direction, data, message, delay):
+        transport = self.server_side if direction == 'up' else self.client_side
+        if transport.is_closing():
+            return
+        if direction == 'up':
+            transport.sendto(data)
+        else:
+            transport.sendto(data, self.client_addr)
+        self.proxy.log.delivered(self.link_id, direction, message, delay)
+
+    def close(self):
+        for transport in (self.client_side, self.server_side):
+            if transport:
+                transport.close()
+
+
+class Proxy:
+    def __init__(self, args, log):
+        self.args = args
+        self.log = log
+        self.next_link = 1
+        self.links = []
+
+    def impairment(self, link_id, direction):
+        args = self.args
+        # Un générateur par lien and par sens : l'ordre d'arrivée des autres clients ne change rien
+        rng = random.Random(f"{args.seed}:{link_id}:{direction}")
+        return Impairment(rng, args.latency / 1000, args.jitter / 1000, args.loss / 100,
+                          args.duplicate / 100, args.reorder / 100, args.reorder_delay / 1000)
+
+    async def handle_client(self, client_reader, client_writer):
+        link_id = self.next_link
+        self.next_link += 1
+        try:
+            server_reader, server_writer = await asyncio.open_connection(self.args.server_host, self.args.server_port)
+        except OSError as e:
+            print(f"[PROXY] Link {link_id}: server unreachable: {e}")
+            client_writer.close()
+            return
+        print(f"[PROXY] Link {link_id} opened")
+        await asyncio.gather(
+            self.pump(link_id, 'up', client_reader, server_writer),
+            self.pump(link_id, 'down', server_reader, client_writer),
+            return_exceptions=True)
+        print(f"[PROXY] Link {link_id} closed")
+
+    async def pump(self, link_id, direction, reader, writer):
+        # TCP ne perd ni ne réordonne rien : seuls le retard and la gigue s'appliquent
+        rng = random.Random(f"{self.args.seed}:{link_id}:tcp-{direction}")
+        impairment = Impairment(rng, self.args.latency / 1000, self.args.jitter / 1000)
+        loop = asyncio.get_running_loop()
+        last_delivery = 0.0
+        try:
+            while True:
+                data = await reader.read(4096)
+                if not data:
+                    break
+                if direction == 'down':
+                    data = await self.rewrite_udp_info(link_id, data)
+                # Les octets d'une connexion TCP restent dans l'ordre malgré la gigue
+                last_delivery = max(loop.time() + impairment.delay(), last_delivery)
+                loop.call_at(last_delivery, writer.write, data)
+        finally:
+            loop.call_at(max(loop.time(), last_delivery), writer.close)
+
+    async def rewrite_udp_info(self, link_id, data):
+        """Remplace l'adresse UDP de la salle annoncée au client par celle d'un relais."""
+        message = data.decode(errors='replace')
+        match = UDP_RE.search(message)
+        if not match:
+            return data
+        host = match.group(1)
+        if host == '0.0.0.0':
+            host = self.args.server_host
+        link = UDPLink(self, link_id, (host, int(match.group(2))))
+        self.links.append(link)
+        relay_port = await link.open(self.args.listen_host)
+        public_host = '127.0.0.1' if self.args.listen_host == '0.0.0.0' else self.args.listen_host
+        print(f"[PROXY] Link {link_id}: UDP {host}:{match.group(2)} relayed on port {relay_port}")
+        return message.replace(match.group(0), f"UDP:{public_host}:{relay_port}").encode()
+
+    def close(self):
+        for link in self.links:
+            link.close()
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value * 1000:.1f}"
+
+
+def format_rate(value):
+    return "n/a" if value is None else f"{value * 100:.1f}%"
+
+
+def print_summary(summary):
+    print(f"messages {summary['messages']}  dropped {summary['dropped']}  duplicated {summary['duplicated']}")
+    print(f"actions {summary['actions']}  refused {summary['refused']}  unanswered {summary['unanswered']}"
+          f"  desync {format_rate(summary['desync_rate'])}")
+    print(f"action->ack   p50 {format_ms(summary['ack_p50']):>7} ms  p99 {format_ms(summary['ack_p99']):>7} ms")
+    print(f"action->echo  p50 {format_ms(summary['echo_p50']):>7} ms  p99 {format_ms(summary['echo_p99']):>7} ms")
+    print(f"snapshots lost {format_rate(summary['snapshot_loss'])}"
+          f"  gap p99 {format_ms(summary['snapshot_gap_p99'])} ms")
+
+
+def start_server(args):
+    command = [sys.executable, os.path.join(ROOT, 'tools', 'loadgen.py'), '--serve',
+               '--port', str(args.server_port), '--udp-ports', args.udp_ports]
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(args.server_startup)
+    return server
+
+
+async def run_proxy(args, log):
+    proxy = Proxy(args, log)
+    server = await asyncio.start_server(proxy.handle_client, args.listen_host, args.listen_port)
+    print(f"[PROXY] Listening on {args.listen_host}:{args.listen_port} -> {args.server_host}:{args.server_port}")
+    try:
+        async with server:
+            if args.duration:
+                await asyncio.sleep(args.duration)
+            else:
+                await server.serve_forever()
+    finally:
+        proxy.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Proxy TCP/UDP local qui dégrade le réseau entre les clients and le serveur, de façon reproductible.")
+    parser.add_argument('--listen-host', default='127.0.0.1')
+    parser.add_argument('--listen-port', type=int, default=12345, help="port TCP où se connectent les clients")
+    parser.add_argument('--server-host', default='127.0.0.1')
+    parser.add_argument('--server-port', type=int, default=12346, help="port TCP du vrai serveur")
+    parser.add_argument('--latency', type=float, default=0.0, help="retard dans chaque sens (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="gigue uniforme autour du retard (ms)")
+    parser.add_argument('--loss', type=float, default=0.0, help="pertes UDP (%%)")
+    parser.add_argument('--duplicate', type=float, default=0.0, help="duplications UDP (%%)")
+    parser.add_argument('--reorder', type=float, default=0.0, help="messages UDP retenus pour être doublés (%%)")
+    parser.add_argument('--reorder-delay', type=float, default=50.0, help="retard ajouté aux messages retenus (ms)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--log', metavar='FILE', help="journal JSON lines de chaque message (réception and livraison)")
+    parser.add_argument('--json', metavar='FILE', help="écrire aussi le résumé dans un fichier JSON")
+    parser.add_argument('--duration', type=float, default=None, help="arrêter après N secondes (défaut: Ctrl+C)")
+    parser.add_argument('--start-server', action='store_true', help="lancer un serveur local sur --server-port")
+    parser.add_argument('--udp-ports', default="20000-22000", help="ports UDP du serveur lancé par --start-server")
+    parser.add_argument('--server-startup', type=float, default=2.0)
+    args = parser.parse_args()
+
+    server = start_server(args) if args.start_server else None
+    log = MessageLog(args.log)
+    try:
+        asyncio.run(run_proxy(args, log))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log.close()
+        if server:
+            server.kill()
+            server.wait()
+
+    summary = log.summary()
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(summary, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'client'))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import argparse
+import json
+import random
+import time
+from shared.constants import GRID_WIDTH, GRID_HEIGHT, PLANT_TYPES, ZOMBIE_TYPES, POSITION_SCALE
+from shared.entities import Projectile
+
+PROJECTILE_SPEED = Projectile(0, 0).speed
+PHASES = ['background', 'cards', 'plants', 'projectiles', 'zombies', 'present', 'frame']
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_zombies(count, rng):
+    zombies = []
+    for i in range(count):
+        zombie_type = rng.choice(list(ZOMBIE_TYPES))
+        zombies.append({
+            'type': zombie_type,
+            'row': rng.randrange(GRID_HEIGHT),
+            'x': rng.randrange(GRID_WIDTH * POSITION_SCALE),
+            'health': rng.randint(1, ZOMBIE_TYPES[zombie_type]['health']),
+            'id': i + 1,
+            'is_eating': rng.random() < 0.2,
+        })
+    return zombies
+
+
+def make_plants(rng, types=('candycane', 'peashooter', 'icewall')):
+    plants = []
+    for row in range(GRID_HEIGHT):
+        for col in range(GRID_WIDTH):
+            plant_type = rng.choice(types)
+            plant = {
+                'id': row * GRID_WIDTH + col + 1,
+                'type': plant_type,
+                'row': row,
+                'col': col,
+                'health': rng.randint(1, PLANT_TYPES[plant_type]['health']),
+                'ready_to_harvest': plant_type == 'candycane' and rng.random() < 0.5,
+            }
+            if plant_type == 'peashooter':
+                plant['shooting'] = rng.random() < 0.5
+            plants.append(plant)
+    return plants
+
+
+def make_projectiles(count, rng):
+    return [{'id': i + 1, 'row': rng.randrange(GRID_HEIGHT), 'x': rng.randrange(GRID_WIDTH * POSITION_SCALE)}
+            for i in range(count)]
+
+
+def make_scenarios(seed):
+    """États de jeu synthétiques au format de shared.game.Game.get_game_state."""
+    rng = random.Random(seed)
+    scenarios = {}
+    for count in (0, 20, 100, 500):
+        scenarios[f"zombies_{count}"] = {'plants': [], 'zombies': make_zombies(count, rng), 'projectiles': []}
+    scenarios['plant_grid'] = {'plants': make_plants(rng), 'zombies': make_zombies(20, rng), 'projectiles': []}
+    scenarios['projectile_storm'] = {
+        'plants': make_plants(rng, ('peashooter',)),
+        'zombies': make_zombies(100, rng),
+        'projectiles': make_projectiles(400, rng),
+    }
+    for state in scenarios.values():
+        state.update({'sun_points': 150, 'energy': 150, 'game_over': False, 'winner': None})
+    return scenarios
+
+
+def advance(state, dt):
+    """Fait bouger zombies and projectiles comme en jeu, pour que les rectangles sales changent."""
+    width = GRID_WIDTH * POSITION_SCALE
+    for zombie in state['zombies']:
+        if not zombie['is_eating']:
+            zombie['x'] = (zombie['x'] - round(ZOMBIE_TYPES[zombie['type']]['speed'] / 5 * POSITION_SCALE * dt)) % width
+    for proj in state['projectiles']:
+        proj['x'] = (proj['x'] + round(PROJECTILE_SPEED * POSITION_SCALE * dt)) % width
+
+
+class PhaseTimer:
+    """Remplace des méthodes d'une instance par des versions chronométrées."""
+
+    def __init__(self):
+        self.samples = {phase: [] for phase in PHASES}
+        self.current = {}
+
+    def wrap(self, owner, method_name, phase):
+        method = getattr(owner, method_name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.current[phase] = self.current.get(phase, 0.0) + time.perf_counter() - start
+        setattr(owner, method_name, timed)
+
+    def commit(self, frame_time):
+        self.current['frame'] = frame_time
+        for phase in PHASES:
+            self.samples[phase].append(self.current.get(phase, 0.0))
+        self.current = {}
+
+    def clear(self):
+        for values in self.samples.values():
+            values.clear()
+
+
+def load_game():
+    os.chdir(ROOT)
+    import client
+    game = client.Game()
+    while not game.assets_ready:
+        game.update()
+        time.sleep(0.005)
+    return game
+
+
+def run_scenario(game, state, args, timer):
+    from interpolation import SnapshotBuffer
+    game.reset_game_state()
+    game.in_game = True
+    game.is_solo = False
+    game.online_game_started = True
+    game.is_attacker = args.attacker
+    game.game_start_time = time.time()
+    game.zombie_buffer = SnapshotBuffer(delay=0, max_extrapolation=0)
+    game.game_state = state
+    game.renderer.invalidate()
+
+    dt = 1 / 60
+    for frame in range(args.warmup + args.frames):
+        if frame == args.warmup:
+            timer.clear()
+        advance(state, dt)
+        game.zombie_buffer.push(time.time(), state['zombies'])
+        start = time.perf_counter()
+        game.render()
+        timer.commit(time.perf_counter() - start)
+    return {phase: list(values) for phase, values in timer.samples.items()}
+
+
+def format_ms(value):
+    return "n/a" if value is None else f"{value * 1000:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de rendu sans écran : chronomètre chaque phase de draw_game.")
+    parser.add_argument('--frames', type=int, default=300, help="images mesurées par scénario")
+    parser.add_argument('--warmup', type=int, default=30, help="images ignorées avant la mesure")
+    parser.add_argument('--scenarios', type=lambda v: v.split(","), default=None,
+                        help="scénarios à lancer, ex: zombies_100,plant_grid (défaut: tous)")
+    parser.add_argument('--attacker', action='store_true', help="afficher l'écran de l'attaquant")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='FILE', help="écrire aussi les percentiles dans un fichier JSON")
+    args = parser.parse_args()
+
+    scenarios = make_scenarios(args.seed)
+    names = args.scenarios or list(scenarios)
+
+    game = load_game()
+    timer = PhaseTimer()
+    timer.wrap(game.renderer, 'begin_frame', 'background')
+    timer.wrap(game, 'draw_buttons', 'cards')
+    timer.wrap(game, 'draw_plants', 'plants')
+    timer.wrap(game, 'draw_projectiles', 'projectiles')
+    timer.wrap(game, 'draw_zombies', 'zombies')
+    timer.wrap(game.renderer, 'end_frame', 'present')
+
+    print(f"{'scenario':<18} {'phase':<12} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    report = {}
+    for name in names:
+        samples = run_scenario(game, scenarios[name], args, timer)
+        report[name] = {}
+        for phase in PHASES:
+            values = samples[phase]
+            row = {
+                'mean': sum(values) / len(values) if values else None,
+                'p50': percentile(values, 50),
+                'p95': percentile(values, 95),
+                'p99': percentile(values, 99),
+            }
+            report[name][phase] = row
+            print(f"{name:<18} {phase:<12} {format_ms(row['mean']):>9} {format_ms(row['p50']):>9} "
+                  f"{format_ms(row['p95']):>9} {format_ms(row['p99']):>9}")
+        print()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=1)
+    game.cleanup()
+
+
+if __name__ == "__main__":
+    main()